@@ -0,0 +1,32 @@
+import asyncio
+
+class AsyncFlightStore:
+    def __init__(self, store):
+        self.store = store
+        self._loop = None
+        self._write_lock = None
+
+    def _lock(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._write_lock = asyncio.Lock()
+        return self._write_lock
+
+    async def read(self, function, *args):
+        if self.store.blocking:
+            return await asyncio.to_thread(function, *args)
+        return function(*args)
+
+    async def write(self, function, *args):
+        if self.store.blocking:
+            async with self._lock():
+                result = await asyncio.to_thread(function, *args)
+        else:
+            result = function(*args)
+        durable = self.store.durable()
+        if durable.done():
+            durable.result()
+        else:
+            await asyncio.wrap_future(durable)
+        return result
@@ -0,0 +1,33 @@
+from time import time_ns
+
+max_sequence = 2 ** 53 - 1
+
+def initial_sequence():
+    return time_ns() // 1000
+
+class ChangeRing:
+    def __init__(self, size, start=0):
+        self.size = size
+        self.last = start
+        self._start = start
+        self._entries = [None] * size
+
+    def __len__(self):
+        return min(self.size, self.last - self._start)
+
+    @property
+    def first(self):
+        return self.last - len(self) + 1
+
+    def append(self, op, value=None):
+        self.last += 1
+        self._entries[self.last % self.size] = (op, value)
+        return self.last
+
+    def since(self, sequence, limit=None):
+        if sequence < self.first - 1 or sequence > self.last:
+            return None
+        stop = self.last if limit is None else min(self.last, sequence + limit)
+        entries = self._entries
+        size = self.size
+        return [(n,) + entries[n % size] for n in range(sequence + 1, stop + 1)]
@@ -0,0 +1,2 @@
+valid_gates = ["A1", "B2", "C3", "D4", "E5"]
+max_batch_size = 10000
@@ -0,0 +1,67 @@
+import asyncio
+
+class Subscription:
+    def __init__(self, matches, size):
+        self.matches = matches
+        self.queue = asyncio.Queue(size)
+        self.overflowed = False
+
+class EventBroker:
+    def __init__(self, queue_size, encode):
+        self.queue_size = queue_size
+        self.encode = encode
+        self._subscriptions = set()
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def subscribe(self, matches=None):
+        subscription = Subscription(matches, self.queue_size)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self._subscriptions.discard(subscription)
+
+    def publish(self, name, flight, **extra):
+        message = None
+        for subscription in list(self._subscriptions):
+            if subscription.matches and not subscription.matches(flight):
+                continue
+            if message is None:
+                message = f"event: {name}\ndata: {self.encode(flight, extra)}\n\n"
+            self._put(subscription, message)
+
+    def publish_many(self, name, flights, **extra):
+        messages = [None] * len(flights)
+        for subscription in list(self._subscriptions):
+            selected = []
+            for i, flight in enumerate(flights):
+                if subscription.matches and not subscription.matches(flight):
+                    continue
+                if messages[i] is None:
+                    messages[i] = f"event: {name}\ndata: {self.encode(flight, extra)}\n\n"
+                selected.append(messages[i])
+            if selected:
+                self._put(subscription, "".join(selected))
+
+    def _put(self, subscription, message):
+        try:
+            subscription.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            subscription.overflowed = True
+            self.unsubscribe(subscription)
+
+    async def stream(self, subscription, keepalive):
+        try:
+            while True:
+                if subscription.overflowed and subscription.queue.empty():
+                    yield "event: overflow\ndata: {}\n\n"
+                    return
+                try:
+                    message = await asyncio.wait_for(subscription.queue.get(), keepalive)
+                except asyncio.TimeoutError:
+                    message = ": keepalive\n\n"
+                yield message
+        finally:
+            self.unsubscribe(subscription)
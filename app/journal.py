@@ -0,0 +1,304 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+
+from app.snapshot import MappedSnapshot, write_snapshot
+from app.store import FlightRecord, FlightStore, normalize_flight_number
+
+logger = logging.getLogger(__name__)
+
+def encode_flight(flight):
+    data = flight.to_dict()
+    data["departure_time"] = flight.departure_time.isoformat()
+    return data
+
+def decode_flight(data):
+    data = dict(data)
+    data["departure_time"] = datetime.fromisoformat(data["departure_time"])
+    return FlightRecord(**data)
+
+def _generation(name, prefix, suffix):
+    if name.startswith(prefix) and name.endswith(suffix):
+        number = name[len(prefix):-len(suffix)]
+        if number.isdigit():
+            return int(number)
+    return None
+
+def _read_lines(path):
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                return
+
+def _fsync_directory(directory):
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+class Journal:
+    log_prefix, log_suffix = "journal.", ".log"
+    snapshot_prefix, snapshot_suffix = "snapshot.", ".bin"
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._condition = threading.Condition()
+        self._pending = []
+        self._closed = False
+        self._error = None
+        self._file = None
+        self.generation = 0
+        self._thread = None
+
+    def _path(self, prefix, generation, suffix):
+        return os.path.join(self.directory, f"{prefix}{generation}{suffix}")
+
+    def _generations(self, prefix, suffix):
+        found = (_generation(name, prefix, suffix) for name in os.listdir(self.directory))
+        return sorted(generation for generation in found if generation is not None)
+
+    def recover(self):
+        snapshots = self._generations(self.snapshot_prefix, self.snapshot_suffix)
+        snapshot = snapshots[-1] if snapshots else 0
+        logs = [generation for generation in self._generations(self.log_prefix, self.log_suffix) if generation >= snapshot]
+        self.generation = max(logs + [snapshot]) + 1
+        self._file = open(self._path(self.log_prefix, self.generation, self.log_suffix), "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="flight-journal", daemon=True)
+        self._thread.start()
+
+        mapped = None
+        if snapshots:
+            mapped = MappedSnapshot(self._path(self.snapshot_prefix, snapshot, self.snapshot_suffix))
+        tail_entries = (
+            entry
+            for generation in logs
+            for entry in _read_lines(self._path(self.log_prefix, generation, self.log_suffix))
+        )
+        return mapped, tail_entries
+
+    def write(self, entry):
+        future = Future()
+        with self._condition:
+            self._check()
+            self._pending.append((json.dumps(entry) + "\n", future))
+            self._condition.notify()
+        return future
+
+    def _check(self):
+        if self._error is not None:
+            raise RuntimeError("Journal failed") from self._error
+        if self._closed:
+            raise RuntimeError("Journal is closed")
+
+    def rotate(self):
+        with self._condition:
+            self._check()
+            self.generation += 1
+            self._pending.append((self.generation, None))
+            self._condition.notify()
+            return self.generation
+
+    def write_snapshot(self, generation, flights, deletion_log):
+        write_snapshot(self._path(self.snapshot_prefix, generation, self.snapshot_suffix), flights, deletion_log)
+        _fsync_directory(self.directory)
+
+        for old in self._generations(self.snapshot_prefix, self.snapshot_suffix):
+            if old < generation:
+                _remove(self._path(self.snapshot_prefix, old, self.snapshot_suffix))
+        for old in self._generations(self.log_prefix, self.log_suffix):
+            if old < generation:
+                _remove(self._path(self.log_prefix, old, self.log_suffix))
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                batch, self._pending = self._pending, []
+                if not batch and self._closed:
+                    self._file.close()
+                    return
+
+            try:
+                self._write_batch(batch)
+            except Exception as error:
+                self._fail(batch, error)
+                return
+
+    def _write_batch(self, batch):
+        futures = []
+        for line, future in batch:
+            if future is None:
+                self._sync(futures)
+                futures = []
+                self._file.close()
+                self._file = open(self._path(self.log_prefix, line, self.log_suffix), "a", encoding="utf-8")
+            else:
+                self._file.write(line)
+                futures.append(future)
+        self._sync(futures)
+
+    def _fail(self, batch, error):
+        logger.exception("Writing journal %s failed", self.directory)
+        with self._condition:
+            self._error = error
+            batch, self._pending = batch + self._pending, []
+        for _, future in batch:
+            if future is not None and not future.done():
+                future.set_exception(error)
+        try:
+            self._file.close()
+        except Exception:
+            pass
+
+    def _sync(self, futures):
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as error:
+            for future in futures:
+                future.set_exception(error)
+            return
+        for future in futures:
+            future.set_result(None)
+
+class JournaledFlightStore(FlightStore):
+    def __init__(self, directory, snapshot_every=100000):
+        super().__init__()
+        self.snapshot_every = snapshot_every
+        self._writes = 0
+        self._snapshot_thread = None
+        self.snapshot_error = None
+        self._last_write = super().durable()
+        self._journal = Journal(directory)
+
+        mapped, tail_entries = self._journal.recover()
+        if mapped:
+            self._load_sorted(mapped.rows())
+            list.extend(self.deletion_log, mapped.deletion_log())
+        for entry in tail_entries:
+            self._apply(entry)
+
+    def _apply(self, entry):
+        op = entry["op"]
+        if op == "append":
+            FlightStore.append(self, decode_flight(entry["flight"]))
+        elif op == "extend":
+            FlightStore.extend(self, [decode_flight(flight) for flight in entry["flights"]])
+        elif op == "set_status":
+            if normalize_flight_number(entry["flight_number"]) in self._by_number:
+                FlightStore.set_status(self, entry["flight_number"], entry["status"])
+        elif op == "delete_many":
+            FlightStore.delete_many(self, entry["flight_numbers"])
+        elif op == "clear":
+            FlightStore.clear(self)
+        elif op == "log":
+            FlightStore._log(self, entry["entries"])
+        elif op == "clear_log":
+            FlightStore._log(self, None)
+
+    def _write(self, entry):
+        self._last_write = self._journal.write(entry)
+        self._writes += 1
+        if self._writes >= self.snapshot_every and not (self._snapshot_thread and self._snapshot_thread.is_alive()):
+            self._start_snapshot()
+
+    def _start_snapshot(self):
+        self._writes = 0
+        flights = list(self._by_number.values())
+        log = list(self.deletion_log)
+        generation = self._journal.rotate()
+        self._snapshot_thread = threading.Thread(
+            target=self._write_snapshot,
+            args=(generation, flights, log),
+            name="flight-snapshot",
+            daemon=True
+        )
+        self._snapshot_thread.start()
+        return self._snapshot_thread
+
+    def _write_snapshot(self, generation, flights, log):
+        try:
+            self._journal.write_snapshot(generation, flights, log)
+            self.snapshot_error = None
+        except Exception as error:
+            self.snapshot_error = error
+            logger.exception("Writing snapshot %s failed", generation)
+
+    def snapshot(self):
+        with self._lock:
+            thread = self._start_snapshot()
+        thread.join()
+        if self.snapshot_error is not None:
+            raise self.snapshot_error
+
+    def durable(self):
+        return self._last_write
+
+    def close(self):
+        if self._snapshot_thread:
+            self._snapshot_thread.join()
+        self._journal.close()
+
+    def append(self, flight):
+        with self._lock:
+            flight = super().append(flight)
+            self._write({"op": "append", "flight": encode_flight(flight)})
+        return flight
+
+    def extend(self, flights):
+        flights = [FlightRecord.from_flight(flight) for flight in flights]
+        with self._lock:
+            super().extend(flights)
+            self._write({"op": "extend", "flights": [encode_flight(flight) for flight in flights]})
+
+    def set_status(self, flight_number, status):
+        with self._lock:
+            flight = super().set_status(flight_number, status)
+            self._write({"op": "set_status", "flight_number": normalize_flight_number(flight_number), "status": status})
+        return flight
+
+    def delete(self, flight_number):
+        removed = self.delete_many([flight_number])
+        return removed[0] if removed else None
+
+    def delete_many(self, flight_numbers):
+        with self._lock:
+            removed = super().delete_many(flight_numbers)
+            if removed:
+                self._write({"op": "delete_many", "flight_numbers": [flight.flight_number for flight in removed]})
+            return removed
+
+    def clear(self):
+        with self._lock:
+            super().clear()
+            self._write({"op": "clear"})
+
+    def _log(self, entries):
+        with self._lock:
+            super()._log(entries)
+            if entries is None:
+                self._write({"op": "clear_log"})
+            else:
+                self._write({"op": "log", "entries": entries})
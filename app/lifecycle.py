@@ -0,0 +1,63 @@
+from enum import IntEnum
+
+class FlightStatus(IntEnum):
+    SCHEDULED = 0
+    AWAITING_BOARDING = 1
+    BOARDING = 2
+    DEPARTING = 3
+    DEPARTED = 4
+    DELAYED = 5
+    CANCELLED = 6
+
+    @property
+    def label(self):
+        return labels[self]
+
+labels = ("Scheduled", "Awaiting Boarding", "Boarding", "Departing", "Departed", "Delayed", "Cancelled")
+codes = {label: status for label, status in zip(labels, FlightStatus)}
+
+_next_statuses = {
+    FlightStatus.SCHEDULED: (FlightStatus.AWAITING_BOARDING, FlightStatus.DELAYED, FlightStatus.CANCELLED),
+    FlightStatus.AWAITING_BOARDING: (FlightStatus.BOARDING, FlightStatus.DELAYED, FlightStatus.CANCELLED),
+    FlightStatus.BOARDING: (FlightStatus.DEPARTING, FlightStatus.DELAYED, FlightStatus.CANCELLED),
+    FlightStatus.DEPARTING: (FlightStatus.DEPARTED,),
+    FlightStatus.DEPARTED: (),
+    FlightStatus.DELAYED: (FlightStatus.AWAITING_BOARDING, FlightStatus.BOARDING, FlightStatus.CANCELLED),
+    FlightStatus.CANCELLED: ()
+}
+
+_required_status_errors = {
+    FlightStatus.SCHEDULED: "Flight was not in Scheduled status",
+    FlightStatus.AWAITING_BOARDING: "Flight was not in Scheduled status",
+    FlightStatus.BOARDING: "Flight was not in Awaiting Boarding status",
+    FlightStatus.DEPARTING: "Flight was not in Boarding status",
+    FlightStatus.DEPARTED: "Flight was not in Departing status"
+}
+
+transition_matrix = tuple(
+    tuple(target == current or target in _next_statuses[current] for target in FlightStatus)
+    for current in FlightStatus
+)
+
+def _transition_error(current, target):
+    if transition_matrix[current][target]:
+        return None
+    if current == FlightStatus.CANCELLED:
+        return "Cancelled flights cannot be rescheduled"
+    if current in (FlightStatus.DEPARTING, FlightStatus.DEPARTED):
+        if target == FlightStatus.DELAYED:
+            return "Flight cannot be delayed after departing"
+        if target == FlightStatus.CANCELLED:
+            return "Flight cannot be cancelled after departing"
+    return _required_status_errors.get(target)
+
+transition_errors = {
+    current.label: {target.label: _transition_error(current, target) for target in FlightStatus}
+    for current in FlightStatus
+}
+
+def can_transition(current_status: str, flight_status: str) -> bool:
+    return transition_matrix[codes[current_status]][codes[flight_status]]
+
+def transition_error(current_status: str, flight_status: str):
+    return transition_errors[current_status][flight_status]
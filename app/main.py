@@ -1,15 +1,55 @@
-from fastapi import FastAPI, status, HTTPException, Query, Request
-from pydantic import BaseModel
+from fastapi import FastAPI, status, HTTPException, Header, Query, Request, Response
+from fastapi.exception_handlers import http_exception_handler, request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from pydantic import BaseModel, Field
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from hashlib import blake2b
+import json
+import os
+from app.store import (
+    FlightExistsError,
+    FlightNotFoundError,
+    FlightStore,
+    GateInUseError,
+    InvalidTransitionError,
+    inactive_statuses,
+    normalize_flight_number
+)
+from app.sqlite_store import SQLiteFlightStore
+from app.journal import JournaledFlightStore
+from app.async_store import AsyncFlightStore
+from app.cache import ResponseCache
+from app.config import max_batch_size, valid_gates
+from app.events import EventBroker
+from app.lifecycle import labels, transition_error
+from app.metrics import Counter, Gauge, Histogram, MetricsMiddleware, Registry, content_type
+from app.profiling import ProfilingMiddleware, RequestProfiler
+
+def create_store():
+    database = os.environ.get("FLIGHTS_DATABASE")
+    if database:
+        return SQLiteFlightStore(database)
+    data_dir = os.environ.get("FLIGHTS_DATA_DIR")
+    if data_dir:
+        return JournaledFlightStore(data_dir, int(os.environ.get("FLIGHTS_SNAPSHOT_EVERY", 100000)))
+    return FlightStore()
 
 app = FastAPI()
 
-flights = []
-deletion_log = []
+flights = create_store()
+deletion_log = flights.deletion_log
+store = AsyncFlightStore(flights)
 
-valid_gates = ["A1", "B2", "C3", "D4", "E5"]
-valid_statuses = ["Scheduled", "Awaiting Boarding", "Boarding", "Departing", "Departed", "Delayed", "Cancelled"]
+valid_statuses = labels
+max_page_size = 1000
+export_chunk_size = 1000
+listing_cache_size = 256
+subscriber_queue_size = 1000
+stream_keepalive = 15
 
 class Flight(BaseModel):
     flight_number: str
@@ -18,6 +58,154 @@ class Flight(BaseModel):
     gate: str
     status: Optional[str] = "Scheduled"
 
+class BatchResult(BaseModel):
+    flight_number: str
+    status_code: int
+    detail: Optional[str] = None
+
+class StatusChange(BaseModel):
+    flight_number: str
+    flight_status: str
+
+class BulkElimination(BaseModel):
+    reason: Optional[str] = None
+    flight_numbers: Optional[List[str]] = None
+    flight_status: Optional[str] = None
+    departure_from: Optional[str] = Field(None, alias="from")
+    departure_to: Optional[str] = Field(None, alias="to")
+
+class Gate(BaseModel):
+    gate: str
+    free: bool
+    flight_number: Optional[str] = None
+
+def encode_flights(page) -> bytes:
+    return b"[" + b",".join([f.to_json() for f in page]) + b"]"
+
+listing_cache = ResponseCache(listing_cache_size)
+
+def encode_event(flight, extra) -> str:
+    data = Flight.model_validate(flight, from_attributes=True).model_dump(mode="json")
+    data.update(extra)
+    return json.dumps(data, separators=(",", ":"))
+
+events = EventBroker(subscriber_queue_size, encode_event)
+
+metrics = Registry()
+request_latency = metrics.register(Histogram(
+    "flights_request_duration_seconds", "Request latency by route and status code", ("method", "route", "status_code")
+))
+transitions = metrics.register(Counter(
+    "flights_transitions_total", "Status transitions applied", ("from_status", "to_status")
+))
+rejections = metrics.register(Counter(
+    "flights_rejections_total", "Requests and batch items rejected with 422, by reason", ("reason",)
+))
+
+def status_counts():
+    counts = dict.fromkeys(valid_statuses, 0)
+    counts.update(flights.count_by_status())
+    return {(flight_status,): count for flight_status, count in counts.items()}
+
+def gate_occupancy():
+    occupants = flights.occupied_gates()
+    return {(gate,): int(gate in occupants) for gate in valid_gates}
+
+metrics.register(Gauge("flights_by_status", "Flights in the store by status", ("status",), status_counts))
+metrics.register(Gauge("flights_gate_occupied", "1 when an active flight is using the gate", ("gate",), gate_occupancy))
+metrics.register(Gauge("flights_deletion_log_entries", "Entries in the deletion log", (), lambda: len(deletion_log)))
+app.add_middleware(MetricsMiddleware, histogram=request_latency)
+
+profiler = RequestProfiler(
+    int(os.environ.get("FLIGHTS_PROFILE_BUFFER", 20)),
+    float(os.environ.get("FLIGHTS_PROFILE_SAMPLE_RATE", 0)),
+    os.environ.get("FLIGHTS_PROFILE_TOKEN"),
+    ("/debug/", "/flights/stream")
+)
+app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+def count_rejections(results):
+    rejected = status.HTTP_422_UNPROCESSABLE_ENTITY
+    for result in results:
+        if result["status_code"] == rejected:
+            rejections.inc(result["detail"])
+
+@app.exception_handler(StarletteHTTPException)
+async def count_http_rejection(request: Request, error: StarletteHTTPException):
+    if error.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY:
+        if isinstance(error.detail, list):
+            count_rejections(error.detail)
+        else:
+            rejections.inc(error.detail)
+    return await http_exception_handler(request, error)
+
+@app.exception_handler(RequestValidationError)
+async def count_validation_rejection(request: Request, error: RequestValidationError):
+    rejections.inc("Request validation failed")
+    return await request_validation_exception_handler(request, error)
+
+def parse_datetime_filter(value: str, detail: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
+
+def parse_departure_range(departure_from: Optional[str], departure_to: Optional[str]):
+    start = end = None
+    if departure_from:
+        start = parse_datetime_filter(departure_from, "Invalid from filter")
+    if departure_to:
+        end = parse_datetime_filter(departure_to, "Invalid to filter")
+        try:
+            date.fromisoformat(departure_to)
+        except ValueError:
+            end += timedelta(microseconds=1)
+        else:
+            end += timedelta(days=1)
+    return start, end
+
+def listing_window(
+    flight_status: Optional[str],
+    departure_time: Optional[str],
+    departure_from: Optional[str],
+    departure_to: Optional[str]
+):
+    if flight_status and flight_status not in valid_statuses:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid status filter")
+    if departure_time and (departure_from or departure_to):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="departure_time cannot be combined with from/to")
+
+    if departure_time and departure_time != "all":
+        start = datetime.combine(parse_datetime_filter(departure_time, "Invalid departure_time filter").date(), time())
+        return start, start + timedelta(days=1)
+    if departure_from or departure_to:
+        return parse_departure_range(departure_from, departure_to)
+    if not departure_time:
+        start = datetime.combine(datetime.now().date(), time())
+        return start, start + timedelta(days=1)
+    return None, None
+
+def encode_cursor(flight) -> str:
+    key, flight_number = flights.position(flight)
+    return urlsafe_b64encode(f"{key}:{flight_number}".encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        key, flight_number = urlsafe_b64decode(cursor.encode()).decode().split(":", 1)
+        return int(key), flight_number
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid cursor")
+
+def listing_etag(key, version) -> str:
+    digest = blake2b(repr(key).encode(), digest_size=8).hexdigest()
+    return f'"{version:x}-{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or "W/" + etag in tags
+
 def flight_number_is_valid(flight_number: str) -> bool:
     if not flight_number.isalnum() or not len(flight_number) <= 10:
         return False
@@ -25,123 +213,366 @@ def flight_number_is_valid(flight_number: str) -> bool:
         return False
     return True
 
-@app.post("/flights/", response_model=Flight, status_code=status.HTTP_201_CREATED)
-def register_flight(flight: Flight):
+def flight_error(flight: Flight) -> Optional[str]:
     if not flight_number_is_valid(flight.flight_number):
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid flight number")
+        return "Invalid flight number"
     if flight.gate not in valid_gates:
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid gate")
+        return "Invalid gate"
     if flight.status not in valid_statuses:
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid status")
-    if any(flight.flight_number == f.flight_number for f in flights):
+        return "Invalid status"
+    return None
+
+def registration_error(flight: Flight, claimed_numbers=(), claimed_gates=()) -> Optional[str]:
+    detail = flight_error(flight)
+    if detail:
+        return detail
+    if flight.flight_number in flights or normalize_flight_number(flight.flight_number) in claimed_numbers:
+        return "Flight number already exists"
+    if flights.gate_occupant(flight.gate) is not None or flight.gate in claimed_gates:
+        return "Gate already used by another flight"
+    return None
+
+@app.post("/flights/", response_model=Flight, status_code=status.HTTP_201_CREATED)
+async def register_flight(flight: Flight):
+    detail = flight_error(flight)
+    if detail:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
+
+    try:
+        record = await store.write(flights.register, flight)
+    except FlightExistsError:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Flight number already exists")
-    if any(f.gate == flight.gate for f in flights if f.status not in ["Departed", "Cancelled"]):
+    except GateInUseError:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Gate already used by another flight")
-    
-    flights.append(flight)
+    events.publish("register", record)
     return flight
 
+def register_batch(batch: List[Flight], atomic: bool):
+    results = []
+    accepted = []
+    claimed_numbers = set()
+    claimed_gates = set()
+    with flights.transaction():
+        for flight in batch:
+            detail = registration_error(flight, claimed_numbers, claimed_gates)
+            if detail:
+                results.append({"flight_number": flight.flight_number, "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY, "detail": detail})
+                continue
+            claimed_numbers.add(normalize_flight_number(flight.flight_number))
+            if flight.status not in inactive_statuses:
+                claimed_gates.add(flight.gate)
+            accepted.append(flight)
+            results.append({"flight_number": flight.flight_number, "status_code": status.HTTP_201_CREATED})
+
+        if atomic and len(accepted) < len(batch):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=[dict(result, index=i) for i, result in enumerate(results) if "detail" in result]
+            )
+        flights.extend(accepted)
+    return results, accepted
+
+@app.post("/flights/batch", response_model=List[BatchResult], status_code=status.HTTP_201_CREATED)
+async def register_flights(batch: List[Flight], atomic: bool = Query(True)):
+    if len(batch) > max_batch_size:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Too many flights in batch")
+    results, accepted = await store.write(register_batch, batch, atomic)
+    count_rejections(results)
+    events.publish_many("register", accepted)
+    return results
+
 @app.get("/flights/", response_model=List[Flight])
-def list_flights(
+async def list_flights(
+    request: Request,
+    flight_status: Optional[str] = Query(None),
+    departure_time: Optional[str] = Query(None),
+    departure_from: Optional[str] = Query(None, alias="from"),
+    departure_to: Optional[str] = Query(None, alias="to"),
+    limit: Optional[int] = Query(None, ge=1, le=max_page_size),
+    cursor: Optional[str] = Query(None)
+):
+    start, end = listing_window(flight_status, departure_time, departure_from, departure_to)
+    key = (flight_status, departure_time, departure_from, departure_to, datetime.now().date())
+    version = await store.read(flights.version)
+    etag = listing_etag(key + (limit, cursor), version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    if limit is None and cursor is None:
+        body = listing_cache.get(key, version)
+        if body is None:
+            body = encode_flights(await store.read(flights.departing_between, start, end, flight_status))
+            listing_cache.put(key, version, body)
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+    limit = limit or max_page_size
+    after = decode_cursor(cursor) if cursor else None
+    page = await store.read(flights.departing_between, start, end, flight_status, after, limit + 1)
+    headers = {"ETag": etag}
+    if len(page) > limit:
+        page = page[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(page[-1])
+    return Response(content=encode_flights(page), media_type="application/json", headers=headers)
+
+@app.get("/flights/export")
+async def export_flights(
+    flight_status: Optional[str] = Query(None),
+    departure_from: Optional[str] = Query(None, alias="from"),
+    departure_to: Optional[str] = Query(None, alias="to")
+):
+    if flight_status and flight_status not in valid_statuses:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid status filter")
+    start, end = parse_departure_range(departure_from, departure_to)
+
+    async def lines():
+        after = None
+        while True:
+            page = await store.read(flights.departing_between, start, end, flight_status, after, export_chunk_size)
+            if page:
+                yield b"".join([f.to_json() + b"\n" for f in page])
+            if len(page) < export_chunk_size:
+                return
+            after = flights.position(page[-1])
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+def change_entry(sequence: int, op: str, value) -> dict:
+    entry = {"sequence": sequence, "op": op}
+    if op == "upsert":
+        entry["flight"] = Flight.model_validate(value, from_attributes=True)
+    elif op == "delete":
+        entry["flight_number"] = value
+    elif op == "log":
+        entry.update(value)
+    return entry
+
+@app.get("/flights/changes")
+async def list_changes(
+    since: Optional[int] = Query(None, ge=0),
+    limit: int = Query(max_page_size, ge=1, le=max_page_size)
+):
+    if since is None:
+        return {"last": await store.read(flights.last_sequence), "changes": []}
+
+    changes = await store.read(flights.changes_since, since, limit)
+    if changes is None:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Changes since this sequence are no longer available")
+    return {
+        "last": changes[-1][0] if changes else since,
+        "changes": [change_entry(*change) for change in changes]
+    }
+
+def stream_filter(flight_status: Optional[str], gate: Optional[str], day: Optional[date]):
+    if not (flight_status or gate or day):
+        return None
+
+    def matches(flight) -> bool:
+        return (
+            (not flight_status or flight.status == flight_status)
+            and (not gate or flight.gate == gate)
+            and (not day or flight.departure_time.date() == day)
+        )
+    return matches
+
+@app.get("/flights/stream")
+async def stream_flights(
     flight_status: Optional[str] = Query(None),
+    gate: Optional[str] = Query(None),
     departure_time: Optional[str] = Query(None)
 ):
     if flight_status and flight_status not in valid_statuses:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid status filter")
+    if gate and gate not in valid_gates:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid gate filter")
+    day = parse_datetime_filter(departure_time, "Invalid departure_time filter").date() if departure_time else None
 
-    filtered = flights
+    subscription = events.subscribe(stream_filter(flight_status, gate, day))
+    return StreamingResponse(
+        events.stream(subscription, stream_keepalive),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
 
-    if flight_status:
-        filtered = [f for f in filtered if (f.status if isinstance(f, Flight) else f["status"]) == flight_status]
+@app.get("/metrics")
+async def read_metrics():
+    collected = await store.read(metrics.collect)
+    return Response(content=metrics.render(collected), media_type=content_type)
 
-    if departure_time:
-        if departure_time == "all":
-            return filtered
-        try:
-            dt_filter = datetime.fromisoformat(departure_time)
-        except Exception:
-            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid departure_time filter")
-        filtered = [
-            f for f in filtered
-            if (f.departure_time if isinstance(f, Flight) else f["departure_time"]).date() == dt_filter.date()
-        ]
-        return filtered
-
-    today = datetime.now().date()
-    filtered = [
-        f for f in filtered
-        if (f.departure_time if isinstance(f, Flight) else f["departure_time"]).date() == today
+def check_profile_token(token: Optional[str]):
+    if profiler.token is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled")
+    if not profiler.authorized(token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid profile token")
+
+@app.get("/debug/profiles")
+async def list_profiles(token: Optional[str] = Header(None, alias="X-Profile-Token")):
+    check_profile_token(token)
+    return [profile.summary() for profile in reversed(profiler.profiles)]
+
+@app.get("/debug/profiles/{profile_id}")
+async def download_profile(
+    profile_id: int,
+    format: str = Query("pstats"),
+    token: Optional[str] = Header(None, alias="X-Profile-Token")
+):
+    check_profile_token(token)
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    if format == "text":
+        return PlainTextResponse(profile.text())
+    if format != "pstats":
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid profile format")
+    return Response(
+        content=profile.dump(),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.prof"'}
+    )
+
+@app.get("/gates/", response_model=List[Gate])
+async def list_gates():
+    occupants = await store.read(flights.occupied_gates)
+    return [
+        {"gate": gate, "free": gate not in occupants, "flight_number": occupants.get(gate)}
+        for gate in valid_gates
     ]
-    return filtered
+
+def status_change_error(flight_number: str, flight_status: str, pending: Optional[dict] = None):
+    if not flight_number_is_valid(flight_number):
+        return status.HTTP_422_UNPROCESSABLE_ENTITY, "Invalid flight number format"
+    if flight_status not in valid_statuses:
+        return status.HTTP_422_UNPROCESSABLE_ENTITY, "Invalid status"
+
+    current_status = pending.get(flight_number) if pending else None
+    if current_status is None:
+        flight = flights.get(flight_number)
+        if not flight:
+            return status.HTTP_404_NOT_FOUND, "Flight not found"
+        current_status = flight.status
+    detail = transition_error(current_status, flight_status)
+    if detail:
+        return status.HTTP_422_UNPROCESSABLE_ENTITY, detail
+    return None
 
 @app.put("/flights/")
-def update_flight_status(
+async def update_flight_status(
     flight_number: str = Query(...),
     flight_status: str = Query(...)
 ):
-    flight_number = flight_number[0:2].upper() + flight_number[2:]
+    flight_number = normalize_flight_number(flight_number)
     if not flight_number_is_valid(flight_number):
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid flight number format")
     if flight_status not in valid_statuses:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid status")
 
-    valid_transitions = {
-        "Scheduled": ["Scheduled", "Awaiting Boarding", "Delayed", "Cancelled"],
-        "Awaiting Boarding": ["Awaiting Boarding", "Boarding", "Delayed", "Cancelled"],
-        "Boarding": ["Boarding", "Departing", "Delayed", "Cancelled"],
-        "Departing": ["Departing", "Departed"],
-        "Departed": ["Departed"],
-        "Delayed": ["Delayed", "Awaiting Boarding", "Boarding", "Cancelled"],
-        "Cancelled": ["Cancelled"]
-    }
-
-    flight = next((f for f in flights if f["flight_number"] == flight_number), None)
-    if flight:
-        if flight["status"] in valid_transitions and flight_status in valid_transitions[flight["status"]]:
-            flight["status"] = flight_status
-            return {"status": flight_status}
-        else:
-            if flight["status"] == "Cancelled":
-                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Cancelled flights cannot be rescheduled")
-            if flight["status"] == "Departing" or flight["status"] == "Departed":
-                if flight_status == "Delayed":
-                    raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Flight cannot be delayed after departing")
-                if flight_status == "Cancelled":
-                    raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Flight cannot be cancelled after departing")
-                
-            if flight_status == "Scheduled":
-                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Flight was not in Scheduled status")
-            if flight_status == "Awaiting Boarding":
-                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Flight was not in Scheduled status")
-            if flight_status == "Boarding":
-                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Flight was not in Awaiting Boarding status")
-            if flight_status == "Departing":
-                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Flight was not in Boarding status")
-            if flight_status == "Departed":
-                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Flight was not in Departing status")
-    else:
+    try:
+        previous, flight = await store.write(flights.transition, flight_number, flight_status, transition_error)
+    except FlightNotFoundError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Flight not found")
+    except InvalidTransitionError as error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error))
+    transitions.inc(previous, flight_status)
+    events.publish("transition", flight)
+    return {"status": flight_status}
+
+def update_batch(batch: List[StatusChange], atomic: bool):
+    results = []
+    pending = {}
+    steps = []
+    with flights.transaction():
+        for change in batch:
+            flight_number = normalize_flight_number(change.flight_number)
+            error = status_change_error(flight_number, change.flight_status, pending)
+            if error:
+                results.append({"flight_number": change.flight_number, "status_code": error[0], "detail": error[1]})
+                continue
+            steps.append((pending.get(flight_number) or flights.get(flight_number).status, change.flight_status))
+            pending[flight_number] = change.flight_status
+            results.append({"flight_number": change.flight_number, "status_code": status.HTTP_200_OK})
+
+        if atomic and any("detail" in result for result in results):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=[dict(result, index=i) for i, result in enumerate(results) if "detail" in result]
+            )
+        changed = [flights.set_status(flight_number, flight_status) for flight_number, flight_status in pending.items()]
+    return results, changed, steps
+
+@app.put("/flights/batch", response_model=List[BatchResult])
+async def update_flight_statuses(batch: List[StatusChange], atomic: bool = Query(False)):
+    if len(batch) > max_batch_size:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Too many flights in batch")
+    results, changed, steps = await store.write(update_batch, batch, atomic)
+    count_rejections(results)
+    for step in steps:
+        transitions.inc(*step)
+    events.publish_many("transition", changed)
+    return results
+
+def eliminate(flight_number: str, reason: str):
+    with flights.transaction():
+        flight = flights.delete(flight_number)
+        if flight is not None:
+            deletion_log.append({
+                "flight_number": flight_number,
+                "reason": reason
+            })
+        return flight
 
 @app.delete("/flights/")
-def eliminate_flight(
+async def eliminate_flight(
     flight_number: str = Query(...),
     reason: Optional[str] = Query(None)
 ):
-    flight_number = flight_number[0:2].upper() + flight_number[2:]
+    flight_number = normalize_flight_number(flight_number)
     if not flight_number_is_valid(flight_number):
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid flight number format")
     
     if not reason:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Reason for elimination is required")
 
-    flight = next((f for f in flights if f["flight_number"] == flight_number), None)
-    if not flight:
+    flight = await store.write(eliminate, flight_number, reason)
+    if flight is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Flight {flight_number} not found")
+    events.publish("eliminate", flight, reason=reason)
 
-    flights.remove(flight)
-    deletion_log.append({
-        "flight_number": flight_number,
-        "reason": reason
-    })
-    
-    return {"message": f"Flight {flight_number} eliminated successfully"}
\ No newline at end of file
+    return {"message": f"Flight {flight_number} eliminated successfully"}
+
+def eliminate_many(flight_numbers: Optional[List[str]], reason: str, start, end, flight_status: Optional[str]):
+    with flights.transaction():
+        if flight_numbers is None:
+            flight_numbers = [normalize_flight_number(f.flight_number) for f in flights.departing_between(start, end, flight_status)]
+        removed = flights.delete_many(flight_numbers)
+        deletion_log.extend({"flight_number": normalize_flight_number(f.flight_number), "reason": reason} for f in removed)
+    return flight_numbers, removed
+
+@app.delete("/flights/batch")
+async def eliminate_flights(batch: BulkElimination):
+    if not batch.reason:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Reason for elimination is required")
+    has_filter = batch.flight_status or batch.departure_from or batch.departure_to
+    if batch.flight_numbers is None and not has_filter:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Flight numbers or a filter are required")
+    if batch.flight_numbers is not None and has_filter:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Flight numbers cannot be combined with a filter")
+
+    if batch.flight_numbers is not None:
+        flight_numbers = [normalize_flight_number(flight_number) for flight_number in batch.flight_numbers]
+        if not all(flight_number_is_valid(flight_number) for flight_number in flight_numbers):
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid flight number format")
+        start = end = None
+    else:
+        flight_numbers = None
+        if batch.flight_status and batch.flight_status not in valid_statuses:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid status filter")
+        start, end = parse_departure_range(batch.departure_from, batch.departure_to)
+
+    flight_numbers, removed = await store.write(eliminate_many, flight_numbers, batch.reason, start, end, batch.flight_status)
+    events.publish_many("eliminate", removed, reason=batch.reason)
+    eliminated = [normalize_flight_number(f.flight_number) for f in removed]
+    not_found = sorted(set(flight_numbers) - set(eliminated))
+    return {
+        "message": f"{len(eliminated)} flights eliminated successfully",
+        "eliminated": eliminated,
+        "not_found": not_found
+    }
\ No newline at end of file
@@ -0,0 +1,111 @@
+import cProfile
+import io
+import marshal
+import pstats
+from collections import deque
+from datetime import datetime, timezone
+from hmac import compare_digest
+from random import random
+from time import perf_counter
+
+token_header = b"x-profile-token"
+
+class RecordedProfile:
+    def __init__(self, profile_id, scope, status_code, duration, profile):
+        self.id = profile_id
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.query = scope.get("query_string", b"").decode("latin-1")
+        self.status_code = status_code
+        self.duration = duration
+        self.created = datetime.now(timezone.utc)
+        self._profile = profile
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "query": self.query,
+            "status_code": self.status_code,
+            "duration": self.duration,
+            "created": self.created.isoformat()
+        }
+
+    def dump(self):
+        return marshal.dumps(self._profile.stats)
+
+    def text(self, limit=50):
+        stream = io.StringIO()
+        pstats.Stats(self._profile, stream=stream).sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+class RequestProfiler:
+    def __init__(self, size, sample_rate=0.0, token=None, skip=("/debug/",)):
+        if sample_rate and token is None:
+            raise ValueError("Sampling requests needs a profile token to download the profiles")
+        self.profiles = deque(maxlen=size)
+        self.sample_rate = sample_rate
+        self.token = token
+        self.skip = skip
+        self._next_id = 1
+        self._active = False
+
+    def authorized(self, token):
+        return self.token is not None and token is not None and compare_digest(token, self.token)
+
+    def get(self, profile_id):
+        for profile in self.profiles:
+            if profile.id == profile_id:
+                return profile
+        return None
+
+    def start(self, scope):
+        if self._active or self.token is None or scope["path"].startswith(self.skip):
+            return None
+        if not (self.sample_rate and random() < self.sample_rate):
+            token = next((value for name, value in scope["headers"] if name == token_header), None)
+            if not self.authorized(token.decode("latin-1") if token else None):
+                return None
+        self._active = True
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def finish(self, profile, scope, status_code, duration):
+        profile.disable()
+        profile.create_stats()
+        self._active = False
+        self.profiles.append(RecordedProfile(self._next_id, scope, status_code, duration, profile))
+        self._next_id += 1
+
+class ProfilingMiddleware:
+    def __init__(self, app, profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        profile = self.profiler.start(scope)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed = perf_counter() - started
+                headers = list(message.get("headers", ()))
+                headers.append((b"server-timing", f"app;dur={elapsed * 1000:.3f}".encode()))
+                headers.append((b"x-process-time", f"{elapsed:.6f}".encode()))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if profile is not None:
+                self.profiler.finish(profile, scope, status_code, perf_counter() - started)
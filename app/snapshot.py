@@ -0,0 +1,138 @@
+import json
+import mmap
+import os
+import struct
+from datetime import datetime, timedelta, timezone
+from sys import intern
+
+from app.store import FlightRecord, departure_key, normalize_flight_number
+
+magic = b"FLTSNAP2"
+header_format = struct.Struct("<8sIII")
+record_format = struct.Struct("<16sqiIIII")
+string_length_format = struct.Struct("<I")
+max_strings = 0xFFFFFFFF
+formats = {
+    magic: (record_format, string_length_format),
+    b"FLTSNAP1": (struct.Struct("<16sqiIIHH"), struct.Struct("<H"))
+}
+naive_offset = -2 ** 31
+same_number = 0xFFFFFFFF
+
+_epoch = datetime(1970, 1, 1)
+
+def _offset(departure_time):
+    offset = departure_time.utcoffset()
+    return naive_offset if offset is None else int(offset.total_seconds())
+
+def _departure_time(key, offset):
+    departure_time = _epoch + timedelta(microseconds=key)
+    if offset == naive_offset:
+        return departure_time
+    return departure_time.replace(tzinfo=timezone.utc if offset == 0 else timezone(timedelta(seconds=offset)))
+
+def write_snapshot(path, flights, deletion_log):
+    strings = {}
+    def code(value):
+        if value not in strings:
+            if len(strings) == max_strings:
+                raise ValueError("Too many distinct strings for a snapshot")
+            encoded = value.encode()
+            if len(encoded) > max_strings:
+                raise ValueError("String too long for a snapshot")
+            strings[value] = (len(strings), encoded)
+        return strings[value][0]
+
+    rows = []
+    for flight in flights:
+        flight_key = normalize_flight_number(flight.flight_number)
+        encoded_key = flight_key.encode()
+        if not 0 < len(encoded_key) <= 16:
+            encoded_key = b"\0" + struct.pack("<I", code(flight_key))
+        number = same_number if flight.flight_number == flight_key else code(flight.flight_number)
+        key = departure_key(flight.departure_time)
+        rows.append((
+            key,
+            flight_key,
+            record_format.pack(
+                encoded_key, key, _offset(flight.departure_time), number,
+                code(flight.arrival), code(flight.gate), code(flight.status)
+            )
+        ))
+    rows.sort()
+    log = json.dumps(list(deletion_log)).encode()
+
+    with open(path + ".tmp", "wb") as file:
+        file.write(header_format.pack(magic, len(strings), len(rows), len(log)))
+        for _, encoded in strings.values():
+            file.write(string_length_format.pack(len(encoded)))
+            file.write(encoded)
+        for row in rows:
+            file.write(row[2])
+        file.write(log)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(path + ".tmp", path)
+
+class MappedSnapshot:
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < header_format.size or self._map[:len(magic)] not in formats:
+            raise ValueError(f"{path} is not a flight snapshot")
+        version, string_count, self.count, log_length = header_format.unpack_from(self._map, 0)
+        self._record_format, string_length_format = formats[version]
+
+        offset = header_format.size
+        self.strings = []
+        for _ in range(string_count):
+            (length,) = string_length_format.unpack_from(self._map, offset)
+            offset += string_length_format.size
+            self.strings.append(intern(self._map[offset:offset + length].decode()))
+            offset += length
+        self._records_offset = offset
+        self._log_offset = offset + self.count * self._record_format.size
+        self._log_length = log_length
+
+    def __len__(self):
+        return self.count
+
+    def deletion_log(self):
+        return json.loads(self._map[self._log_offset:self._log_offset + self._log_length])
+
+    def rows(self):
+        records = memoryview(self._map)[self._records_offset:self._log_offset]
+        strings = self.strings
+        row = 0
+        for encoded_key, key, _, number, _, gate, status in self._record_format.iter_unpack(records):
+            if encoded_key[0]:
+                flight_key = encoded_key.rstrip(b"\0").decode()
+            else:
+                flight_key = strings[struct.unpack_from("<I", encoded_key, 1)[0]]
+            flight_number = flight_key if number == same_number else strings[number]
+            yield key, flight_key, strings[gate], strings[status], MappedFlightRecord(self, row, flight_number)
+            row += 1
+
+    def decode(self, row):
+        _, key, offset, _, arrival, gate, status = self._record_format.unpack_from(
+            self._map, self._records_offset + row * self._record_format.size
+        )
+        return self.strings[arrival], _departure_time(key, offset), self.strings[gate], self.strings[status]
+
+class MappedFlightRecord(FlightRecord):
+    __slots__ = ("_snapshot", "_row")
+
+    def __init__(self, snapshot, row, flight_number):
+        self._snapshot = snapshot
+        self._row = row
+        self.flight_number = flight_number
+
+    def __getattr__(self, name):
+        if name not in FlightRecord.fields:
+            raise AttributeError(name)
+        for field, value in zip(("arrival", "departure_time", "gate", "status"), self._snapshot.decode(self._row)):
+            try:
+                object.__getattribute__(self, field)
+            except AttributeError:
+                object.__setattr__(self, field, value)
+        return object.__getattribute__(self, name)
@@ -0,0 +1,283 @@
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from app.changes import initial_sequence, max_sequence
+from app.store import (
+    FlightRecord,
+    FlightRepository,
+    change_history_size,
+    departure_key,
+    inactive_statuses,
+    normalize_flight_number
+)
+
+schema = """
+CREATE TABLE IF NOT EXISTS flights (
+    flight_key TEXT PRIMARY KEY,
+    flight_number TEXT NOT NULL,
+    arrival TEXT NOT NULL,
+    departure_time TEXT NOT NULL,
+    departure_key INTEGER NOT NULL,
+    gate TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS flights_departure ON flights (departure_key, flight_key);
+CREATE INDEX IF NOT EXISTS flights_status ON flights (status, departure_key, flight_key);
+CREATE INDEX IF NOT EXISTS flights_gate ON flights (gate, status);
+CREATE TABLE IF NOT EXISTS deletion_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    flight_number TEXT NOT NULL,
+    reason TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS changes (
+    sequence INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS store_version (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    version INTEGER NOT NULL
+);
+"""
+
+_columns = "flight_number, arrival, departure_time, gate, status"
+_inactive = "('" + "', '".join(inactive_statuses) + "')"
+
+def _record(row):
+    return FlightRecord(row[0], row[1], datetime.fromisoformat(row[2]), row[3], row[4])
+
+def _upsert(row):
+    return "upsert", json.dumps(row, separators=(",", ":"))
+
+def _change(sequence, op, value):
+    if op == "upsert":
+        return sequence, op, _record(json.loads(value))
+    if op == "log":
+        return sequence, op, json.loads(value)
+    return sequence, op, value
+
+def _row(flight):
+    return (
+        normalize_flight_number(flight.flight_number),
+        flight.flight_number,
+        flight.arrival,
+        flight.departure_time.isoformat(),
+        departure_key(flight.departure_time),
+        flight.gate,
+        flight.status
+    )
+
+class SQLiteDeletionLog:
+    def __init__(self, store):
+        self._store = store
+
+    def __len__(self):
+        return self._store._connection().execute("SELECT COUNT(*) FROM deletion_log").fetchone()[0]
+
+    def __iter__(self):
+        rows = self._store._connection().execute("SELECT flight_number, reason FROM deletion_log ORDER BY id").fetchall()
+        return iter([{"flight_number": flight_number, "reason": reason} for flight_number, reason in rows])
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def append(self, entry):
+        self.extend([entry])
+
+    def extend(self, entries):
+        entries = list(entries)
+        with self._store.transaction() as connection:
+            connection.executemany(
+                "INSERT INTO deletion_log (flight_number, reason) VALUES (?, ?)",
+                [(entry["flight_number"], entry["reason"]) for entry in entries]
+            )
+            self._store._record(connection, [("log", json.dumps(entry)) for entry in entries])
+
+    def clear(self):
+        with self._store.transaction() as connection:
+            connection.execute("DELETE FROM deletion_log")
+            self._store._record(connection, [("clear_log", None)])
+
+class SQLiteFlightStore(FlightRepository):
+    def __init__(self, path, change_history=change_history_size):
+        self.path = path
+        self.change_history = change_history
+        self._local = threading.local()
+        self.deletion_log = SQLiteDeletionLog(self)
+        connection = self._connection()
+        connection.executescript(schema)
+        start = initial_sequence()
+        connection.execute("INSERT OR IGNORE INTO store_version VALUES (0, ?)", (start,))
+        connection.execute("UPDATE store_version SET version = ? WHERE version > ?", (start, max_sequence))
+        connection.execute(
+            "INSERT INTO sqlite_sequence (name, seq) SELECT 'changes', ? "
+            "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'changes')",
+            (start,)
+        )
+        if self.last_sequence() > max_sequence:
+            connection.execute("DELETE FROM changes")
+            connection.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'changes'", (start,))
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, cached_statements=256, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            self._local.connection = connection
+            self._local.depth = 0
+        return connection
+
+    @contextmanager
+    def transaction(self):
+        connection = self._connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield connection
+            finally:
+                self._local.depth -= 1
+            return
+
+        connection.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield connection
+            connection.execute("UPDATE store_version SET version = version + 1")
+        except BaseException:
+            self._local.depth = 0
+            connection.execute("ROLLBACK")
+            raise
+        self._local.depth = 0
+        connection.execute("COMMIT")
+
+    def version(self):
+        return self._connection().execute("SELECT version FROM store_version").fetchone()[0]
+
+    def last_sequence(self):
+        return self._connection().execute("SELECT seq FROM sqlite_sequence WHERE name = 'changes'").fetchone()[0]
+
+    def changes_since(self, sequence, limit=None):
+        connection = self._connection()
+        rows = connection.execute(
+            "SELECT sequence, op, value FROM changes WHERE sequence > ? ORDER BY sequence LIMIT ?",
+            (sequence, -1 if limit is None else limit)
+        ).fetchall()
+        if sequence > self.last_sequence() or (rows and rows[0][0] != sequence + 1):
+            return None
+        return [_change(*row) for row in rows]
+
+    def _record(self, connection, changes):
+        connection.executemany("INSERT INTO changes (op, value) VALUES (?, ?)", changes)
+        connection.execute(
+            "DELETE FROM changes WHERE sequence <= (SELECT seq FROM sqlite_sequence WHERE name = 'changes') - ?",
+            (self.change_history,)
+        )
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM flights").fetchone()[0]
+
+    def __iter__(self):
+        rows = self._connection().execute(f"SELECT {_columns} FROM flights ORDER BY rowid").fetchall()
+        return iter([_record(row) for row in rows])
+
+    def get(self, flight_number):
+        row = self._connection().execute(
+            f"SELECT {_columns} FROM flights WHERE flight_key = ?", (normalize_flight_number(flight_number),)
+        ).fetchone()
+        return _record(row) if row else None
+
+    def gate_occupant(self, gate):
+        row = self._connection().execute(
+            f"SELECT flight_key FROM flights WHERE gate = ? AND status NOT IN {_inactive} ORDER BY rowid LIMIT 1", (gate,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def occupied_gates(self):
+        rows = self._connection().execute(
+            f"SELECT gate, flight_key FROM flights WHERE status NOT IN {_inactive} ORDER BY rowid DESC"
+        ).fetchall()
+        return dict(rows)
+
+    def with_status(self, status):
+        rows = self._connection().execute(f"SELECT {_columns} FROM flights WHERE status = ? ORDER BY rowid", (status,)).fetchall()
+        return [_record(row) for row in rows]
+
+    def count_by_status(self):
+        return dict(self._connection().execute("SELECT status, COUNT(*) FROM flights GROUP BY status").fetchall())
+
+    def departing_between(self, start=None, end=None, status=None, after=None, limit=None):
+        conditions = []
+        parameters = []
+        if start is not None:
+            conditions.append("departure_key >= ?")
+            parameters.append(departure_key(start))
+        if end is not None:
+            conditions.append("departure_key < ?")
+            parameters.append(departure_key(end))
+        if status is not None:
+            conditions.append("status = ?")
+            parameters.append(status)
+        if after is not None:
+            conditions.append("(departure_key, flight_key) > (?, ?)")
+            parameters.extend(after)
+        sql = f"SELECT {_columns} FROM flights"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY departure_key, flight_key"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        return [_record(row) for row in self._connection().execute(sql, parameters).fetchall()]
+
+    def append(self, flight):
+        flight = FlightRecord.from_flight(flight)
+        row = _row(flight)
+        with self.transaction() as connection:
+            connection.execute("INSERT OR REPLACE INTO flights VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+            self._record(connection, [_upsert(row[1:4] + row[5:])])
+        return flight
+
+    def extend(self, flights):
+        rows = [_row(FlightRecord.from_flight(flight)) for flight in flights]
+        with self.transaction() as connection:
+            connection.executemany("INSERT OR REPLACE INTO flights VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._record(connection, [_upsert(row[1:4] + row[5:]) for row in rows])
+
+    def set_status(self, flight_number, status):
+        key = normalize_flight_number(flight_number)
+        with self.transaction() as connection:
+            row = connection.execute(
+                f"UPDATE flights SET status = ? WHERE flight_key = ? RETURNING {_columns}", (status, key)
+            ).fetchone()
+            if row is not None:
+                self._record(connection, [_upsert(row)])
+        if row is None:
+            raise KeyError(key)
+        return _record(row)
+
+    def delete(self, flight_number):
+        return next(iter(self.delete_many([flight_number])), None)
+
+    def delete_many(self, flight_numbers):
+        removed = []
+        with self.transaction() as connection:
+            for flight_number in flight_numbers:
+                key = normalize_flight_number(flight_number)
+                row = connection.execute(f"DELETE FROM flights WHERE flight_key = ? RETURNING {_columns}", (key,)).fetchone()
+                if row:
+                    removed.append((key, _record(row)))
+            self._record(connection, [("delete", key) for key, _ in removed])
+        return [flight for _, flight in removed]
+
+    def clear(self):
+        with self.transaction() as connection:
+            connection.execute("DELETE FROM flights")
+            self._record(connection, [("clear", None)])
@@ -0,0 +1,432 @@
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from concurrent.futures import Future
+from datetime import datetime, time, timedelta
+from sys import intern
+
+from pydantic_core import to_json
+
+from app.changes import ChangeRing, initial_sequence
+
+inactive_statuses = ("Departed", "Cancelled")
+bulk_delete_threshold = 64
+change_history_size = 100000
+
+_epoch = datetime(1970, 1, 1)
+_microsecond = timedelta(microseconds=1)
+_durable = Future()
+_durable.set_result(None)
+
+class FlightStoreError(Exception):
+    pass
+
+class FlightExistsError(FlightStoreError):
+    pass
+
+class GateInUseError(FlightStoreError):
+    pass
+
+class FlightNotFoundError(FlightStoreError):
+    pass
+
+class InvalidTransitionError(FlightStoreError):
+    pass
+
+def normalize_flight_number(flight_number: str) -> str:
+    return flight_number[0:2].upper() + flight_number[2:]
+
+def departure_key(departure_time: datetime) -> int:
+    return (departure_time.replace(tzinfo=None) - _epoch) // _microsecond
+
+class FlightRecord:
+    fields = ("flight_number", "arrival", "departure_time", "gate", "status")
+    __slots__ = fields + ("_json",)
+
+    def __init__(self, flight_number, arrival, departure_time, gate, status="Scheduled"):
+        self.flight_number = flight_number
+        self.arrival = intern(arrival)
+        self.departure_time = departure_time
+        self.gate = intern(gate)
+        self.status = intern(status)
+
+    @classmethod
+    def from_flight(cls, flight):
+        if isinstance(flight, cls):
+            return flight
+        if isinstance(flight, dict):
+            return cls(**flight)
+        return cls(**{name: getattr(flight, name) for name in FlightRecord.fields})
+
+    def __getitem__(self, name):
+        if name not in FlightRecord.fields:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __repr__(self):
+        return f"FlightRecord({self.flight_number!r}, {self.status!r})"
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in FlightRecord.fields}
+
+    def to_json(self):
+        try:
+            return self._json
+        except AttributeError:
+            self._json = to_json(self.to_dict())
+            return self._json
+
+    def replace(self, **changes):
+        values = self.to_dict()
+        values.update(changes)
+        return FlightRecord(**values)
+
+class FlightRepository(ABC):
+    """Storage for flights, indexed by flight number, gate, status and departure time.
+
+    Consistency model: every mutation is applied atomically and all mutations
+    are serialized, so they take effect in a single total order. ``register``
+    and ``transition`` run their checks and their write as one step, and a
+    ``transaction()`` block makes a group of checks and writes atomic (the
+    in-memory store does not roll back, so check everything before writing). Reads
+    return immutable records; a status change replaces the record instead of
+    modifying it. Each read sees the store as of one point in that order.
+    Streamed exports read in chunks, and each chunk is consistent on its own.
+    ``transition`` returns the status it replaced along with the new record.
+
+    ``blocking`` backends do I/O on every call and should be called from a
+    worker thread; the others only touch memory. ``durable()`` returns a
+    future that completes once every write made so far has been persisted.
+    ``version()`` changes whenever the stored flights do, and is not reused
+    after a restart.
+
+    Every change to the flights or the deletion log is stamped with the next
+    sequence number and kept in a bounded history. ``changes_since(n)``
+    returns ``(sequence, op, value)`` for each later change, where op is
+    ``upsert`` (value is the flight), ``delete`` (the normalized flight
+    number), ``clear``, ``log`` (a deletion log entry) or ``clear_log``. It
+    returns None when changes after ``n`` are no longer in the history.
+    """
+
+    deletion_log = None
+    blocking = True
+
+    @abstractmethod
+    def transaction(self): ...
+
+    @abstractmethod
+    def version(self): ...
+
+    @abstractmethod
+    def last_sequence(self): ...
+
+    @abstractmethod
+    def changes_since(self, sequence, limit=None): ...
+
+    @abstractmethod
+    def __len__(self): ...
+
+    @abstractmethod
+    def __iter__(self): ...
+
+    def __contains__(self, flight_number):
+        return self.get(flight_number) is not None
+
+    @abstractmethod
+    def get(self, flight_number): ...
+
+    @abstractmethod
+    def gate_occupant(self, gate): ...
+
+    @abstractmethod
+    def occupied_gates(self): ...
+
+    @abstractmethod
+    def with_status(self, status): ...
+
+    @abstractmethod
+    def count_by_status(self): ...
+
+    @abstractmethod
+    def departing_between(self, start=None, end=None, status=None, after=None, limit=None): ...
+
+    def departing_on(self, day, status=None, after=None, limit=None):
+        start = datetime.combine(day, time())
+        return self.departing_between(start, start + timedelta(days=1), status, after, limit)
+
+    def durable(self):
+        return _durable
+
+    def position(self, flight):
+        return departure_key(flight.departure_time), normalize_flight_number(flight.flight_number)
+
+    @abstractmethod
+    def append(self, flight): ...
+
+    @abstractmethod
+    def extend(self, flights): ...
+
+    @abstractmethod
+    def set_status(self, flight_number, status): ...
+
+    @abstractmethod
+    def delete(self, flight_number): ...
+
+    @abstractmethod
+    def delete_many(self, flight_numbers): ...
+
+    @abstractmethod
+    def clear(self): ...
+
+    def register(self, flight):
+        with self.transaction():
+            if flight.flight_number in self:
+                raise FlightExistsError(flight.flight_number)
+            if self.gate_occupant(flight.gate) is not None:
+                raise GateInUseError(flight.gate)
+            return self.append(flight)
+
+    def transition(self, flight_number, status, validate):
+        with self.transaction():
+            flight = self.get(flight_number)
+            if flight is None:
+                raise FlightNotFoundError(flight_number)
+            previous = flight.status
+            detail = validate(previous, status)
+            if detail:
+                raise InvalidTransitionError(detail)
+            return previous, self.set_status(flight_number, status)
+
+class DeletionLog(list):
+    def __init__(self, store):
+        super().__init__()
+        self._store = store
+
+    def append(self, entry):
+        self.extend([entry])
+
+    def extend(self, entries):
+        self._store._log(list(entries))
+
+    def clear(self):
+        self._store._log(None)
+
+class FlightStore(FlightRepository):
+    blocking = False
+
+    def __init__(self, change_history=change_history_size):
+        self.deletion_log = DeletionLog(self)
+        self._by_number = {}
+        self._gate_occupants = {}
+        self._departures = []
+        self._by_status = {}
+        self._status_departures = {}
+        self._changes = ChangeRing(change_history, initial_sequence())
+        self._lock = threading.RLock()
+
+    def transaction(self):
+        return self._lock
+
+    def version(self):
+        return self._changes.last
+
+    def last_sequence(self):
+        return self._changes.last
+
+    def changes_since(self, sequence, limit=None):
+        with self._lock:
+            return self._changes.since(sequence, limit)
+
+    def __len__(self):
+        return len(self._by_number)
+
+    def __iter__(self):
+        return iter(list(self._by_number.values()))
+
+    def __contains__(self, flight_number):
+        return normalize_flight_number(flight_number) in self._by_number
+
+    def get(self, flight_number):
+        return self._by_number.get(normalize_flight_number(flight_number))
+
+    def gate_occupant(self, gate):
+        with self._lock:
+            keys = self._gate_occupants.get(gate)
+            return next(iter(keys)) if keys else None
+
+    def occupied_gates(self):
+        with self._lock:
+            return {gate: next(iter(keys)) for gate, keys in self._gate_occupants.items()}
+
+    def with_status(self, status):
+        with self._lock:
+            return [self._by_number[key] for key in self._by_status.get(status, ())]
+
+    def count_by_status(self):
+        with self._lock:
+            return {status: len(keys) for status, keys in self._by_status.items()}
+
+    def departing_between(self, start=None, end=None, status=None, after=None, limit=None):
+        with self._lock:
+            return self._departing_between(start, end, status, after, limit)
+
+    def _departing_between(self, start, end, status, after, limit):
+        lo_key = None if start is None else departure_key(start)
+        hi_key = None if end is None else departure_key(end)
+        departures = self._departures if status is None else self._status_departures.get(status, [])
+        lo = 0 if lo_key is None else bisect_left(departures, (lo_key,))
+        hi = len(departures) if hi_key is None else bisect_left(departures, (hi_key,))
+        if after is not None:
+            lo = max(lo, bisect_right(departures, after))
+        stop = hi if limit is None else min(hi, lo + limit)
+        return [self._by_number[key] for _, key in departures[lo:stop]]
+
+    def append(self, flight):
+        with self._lock:
+            flight = FlightRecord.from_flight(flight)
+            key = normalize_flight_number(flight.flight_number)
+            self._remove(key)
+            self._by_number[key] = flight
+            entry = (departure_key(flight.departure_time), key)
+            insort(self._departures, entry)
+            self._index_status(key, flight, entry)
+            self._changes.append("upsert", flight)
+            return flight
+
+    def extend(self, flights):
+        with self._lock:
+            records = {}
+            for flight in flights:
+                flight = FlightRecord.from_flight(flight)
+                records[normalize_flight_number(flight.flight_number)] = flight
+            entries = []
+            by_status = {}
+            for key, flight in records.items():
+                self._remove(key)
+                self._by_number[key] = flight
+                entry = (departure_key(flight.departure_time), key)
+                entries.append(entry)
+                by_status.setdefault(flight.status, []).append(entry)
+                self._index_status(key, flight)
+                self._changes.append("upsert", flight)
+            self._departures.extend(entries)
+            self._departures.sort()
+            for status, status_entries in by_status.items():
+                departures = self._status_departures.setdefault(status, [])
+                departures.extend(status_entries)
+                departures.sort()
+
+    def set_status(self, flight_number, status):
+        with self._lock:
+            key = normalize_flight_number(flight_number)
+            flight = self._by_number[key]
+            entry = (departure_key(flight.departure_time), key)
+            self._unindex_status(key, flight, entry)
+            flight = self._by_number[key] = flight.replace(status=status)
+            self._index_status(key, flight, entry)
+            self._changes.append("upsert", flight)
+            return flight
+
+    def delete(self, flight_number):
+        with self._lock:
+            key = normalize_flight_number(flight_number)
+            flight = self._remove(key)
+            if flight is not None:
+                self._changes.append("delete", key)
+            return flight
+
+    def _remove(self, key):
+        flight = self._by_number.pop(key, None)
+        if flight is not None:
+            entry = (departure_key(flight.departure_time), key)
+            del self._departures[bisect_left(self._departures, entry)]
+            self._unindex_status(key, flight, entry)
+        return flight
+
+    def delete_many(self, flight_numbers):
+        with self._lock:
+            removed = {}
+            for flight_number in flight_numbers:
+                key = normalize_flight_number(flight_number)
+                flight = self._by_number.pop(key, None)
+                if flight is not None:
+                    self._unindex_status(key, flight)
+                    self._changes.append("delete", key)
+                    removed[key] = flight
+            if len(removed) <= bulk_delete_threshold:
+                for key, flight in removed.items():
+                    entry = (departure_key(flight.departure_time), key)
+                    del self._departures[bisect_left(self._departures, entry)]
+                    self._unindex_departure(flight.status, entry)
+            else:
+                self._departures[:] = [entry for entry in self._departures if entry[1] not in removed]
+                for status in {flight.status for flight in removed.values()}:
+                    departures = [entry for entry in self._status_departures[status] if entry[1] not in removed]
+                    if departures:
+                        self._status_departures[status] = departures
+                    else:
+                        del self._status_departures[status]
+            return list(removed.values())
+
+    def clear(self):
+        with self._lock:
+            self._by_number.clear()
+            self._gate_occupants.clear()
+            self._departures.clear()
+            self._by_status.clear()
+            self._status_departures.clear()
+            self._changes.append("clear")
+
+    def _log(self, entries):
+        with self._lock:
+            if entries is None:
+                list.clear(self.deletion_log)
+                self._changes.append("clear_log")
+                return
+            list.extend(self.deletion_log, entries)
+            for entry in entries:
+                self._changes.append("log", entry)
+
+    def _load_sorted(self, rows):
+        by_number = self._by_number
+        departures = self._departures
+        by_status = self._by_status
+        status_departures = self._status_departures
+        for departure, key, gate, status, flight in rows:
+            by_number[key] = flight
+            entry = (departure, key)
+            departures.append(entry)
+            keys = by_status.get(status)
+            if keys is None:
+                keys = by_status[status] = {}
+                status_departures[status] = []
+            keys[key] = None
+            status_departures[status].append(entry)
+            if status not in inactive_statuses:
+                self._gate_occupants.setdefault(gate, {})[key] = None
+
+    def _index_status(self, key, flight, entry=None):
+        self._by_status.setdefault(flight.status, {})[key] = None
+        if entry is not None:
+            insort(self._status_departures.setdefault(flight.status, []), entry)
+        if flight.status not in inactive_statuses:
+            self._gate_occupants.setdefault(flight.gate, {})[key] = None
+
+    def _unindex_departure(self, status, entry):
+        departures = self._status_departures[status]
+        del departures[bisect_left(departures, entry)]
+        if not departures:
+            del self._status_departures[status]
+
+    def _unindex_status(self, key, flight, entry=None):
+        keys = self._by_status[flight.status]
+        del keys[key]
+        if not keys:
+            del self._by_status[flight.status]
+        if entry is not None:
+            self._unindex_departure(flight.status, entry)
+        occupants = self._gate_occupants.get(flight.gate)
+        if occupants and key in occupants:
+            del occupants[key]
+            if not occupants:
+                del self._gate_occupants[flight.gate]
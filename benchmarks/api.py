@@ -0,0 +1,217 @@
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+from itertools import count
+
+import httpx
+import uvicorn
+from fastapi.testclient import TestClient
+
+from app import main as api
+from app.store import FlightRecord
+
+days = 30
+update_pool = 100
+_numbers = count()
+
+def make_flights(size, prefix="FL"):
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    first_day = today - timedelta(days=days // 2)
+    statuses = api.valid_statuses
+    gates = api.valid_gates[:-1]
+    step = days * 86400 / max(size, 1)
+    return [
+        FlightRecord(
+            f"{prefix}{i}",
+            "Los Angeles",
+            first_day + timedelta(seconds=int(i * step)),
+            gates[i % len(gates)],
+            statuses[i % len(statuses)]
+        )
+        for i in range(size)
+    ]
+
+def preload(size):
+    api.flights.clear()
+    api.deletion_log.clear()
+    api.flights.extend(make_flights(size))
+    api.flights.extend(make_flights(update_pool, "UP"))
+
+def register_request(i):
+    n = next(_numbers)
+    return "POST", "/flights/", None, {
+        "flight_number": f"BR{n}",
+        "arrival": "Bogota",
+        "departure_time": datetime.now().isoformat(),
+        "gate": api.valid_gates[-1],
+        "status": "Departed"
+    }
+
+def update_request(i):
+    flight_status = "Awaiting Boarding" if (i // update_pool) % 2 == 0 else "Delayed"
+    return "PUT", "/flights/", {"flight_number": f"UP{i % update_pool}", "flight_status": flight_status}, None
+
+def reset_updates():
+    for i in range(update_pool):
+        api.flights.set_status(f"UP{i}", "Delayed")
+
+def eliminate_requests(total):
+    start = next(_numbers)
+    for _ in range(total):
+        next(_numbers)
+    api.flights.extend(
+        FlightRecord(f"EL{start + i}", "Los Angeles", datetime.now(), api.valid_gates[-1], "Departed") for i in range(total)
+    )
+    return lambda i: ("DELETE", "/flights/", {"flight_number": f"EL{start + i}", "reason": "Benchmark"}, None)
+
+def listing(params):
+    return lambda i: ("GET", "/flights/", params, None)
+
+def scenarios():
+    today = datetime.now().date()
+    return [
+        ("list_flights", "today", listing({})),
+        ("list_flights", "day", listing({"departure_time": (today - timedelta(days=1)).isoformat()})),
+        ("list_flights", "status", listing({"flight_status": "Boarding"})),
+        ("list_flights", "range", listing({"from": (today - timedelta(days=2)).isoformat(), "to": today.isoformat()})),
+        ("list_flights", "page", listing({"departure_time": "all", "limit": 100})),
+        ("list_flights", "status_page", listing({"departure_time": "all", "flight_status": "Delayed", "limit": 100})),
+        ("register_flight", "departed", register_request),
+        ("update_flight_status", "toggle", update_request),
+        ("eliminate_flight", "by_number", None)
+    ]
+
+def percentile(latencies, fraction):
+    index = min(len(latencies) - 1, int(round(fraction * (len(latencies) - 1))))
+    return latencies[index]
+
+def measure(send, make_request, total, warmup, concurrency):
+    for i in range(warmup):
+        send(*make_request(i))
+
+    def timed(i):
+        started = time.perf_counter()
+        send(*make_request(warmup + i))
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        latencies = [timed(i) for i in range(total)]
+    else:
+        with ThreadPoolExecutor(concurrency) as pool:
+            latencies = list(pool.map(timed, range(total)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": total,
+        "throughput": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / total * 1000, 3)
+    }
+
+def sender(client):
+    def send(method, url, params, body):
+        response = client.request(method, url, params=params, json=body)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {url} {params or body}: {response.status_code} {response.text}")
+    return send
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class SocketServer:
+    def __init__(self):
+        self.port = free_port()
+        self.server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=self.port, log_level="warning", lifespan="off"))
+        self.thread = threading.Thread(target=self.server.run, name="benchmark-server", daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return f"http://127.0.0.1:{self.port}"
+
+    def __exit__(self, *exc_info):
+        self.server.should_exit = True
+        self.thread.join()
+
+def run_mode(mode, size, args, results):
+    with ExitStack() as stack:
+        if mode == "inprocess":
+            client = stack.enter_context(TestClient(api.app))
+        else:
+            base_url = stack.enter_context(SocketServer())
+            client = stack.enter_context(httpx.Client(base_url=base_url, limits=httpx.Limits(max_connections=args.concurrency)))
+        send = sender(client)
+        concurrency = args.concurrency if mode == "socket" else 1
+        for endpoint, scenario, make_request in scenarios():
+            if args.endpoint and endpoint not in args.endpoint:
+                continue
+            if endpoint == "update_flight_status":
+                reset_updates()
+            if make_request is None:
+                make_request = eliminate_requests(args.requests + args.warmup)
+            result = {"mode": mode, "size": size, "endpoint": endpoint, "scenario": scenario}
+            result.update(measure(send, make_request, args.requests, args.warmup, concurrency))
+            results.append(result)
+            print(
+                f"{mode:<9} {size:>8} {endpoint:<20} {scenario:<12} "
+                f"{result['throughput']:>9.1f} req/s  p50 {result['p50_ms']:>8.3f} ms  p99 {result['p99_ms']:>8.3f} ms",
+                flush=True
+            )
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure flight API throughput and latency per endpoint.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--modes", choices=["inprocess", "socket"], nargs="+", default=["inprocess", "socket"])
+    parser.add_argument("--endpoint", choices=["list_flights", "register_flight", "update_flight_status", "eliminate_flight"], nargs="+")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=1, help="parallel clients in socket mode")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+    for variable in ("FLIGHTS_DATABASE", "FLIGHTS_DATA_DIR"):
+        if os.environ.get(variable):
+            parser.error(f"{variable} is set; the benchmark clears the store, so run it against the in-memory store")
+
+    results = []
+    for size in args.sizes:
+        started = time.perf_counter()
+        preload(size)
+        print(f"preloaded {size} flights in {time.perf_counter() - started:.1f}s", flush=True)
+        for mode in args.modes:
+            run_mode(mode, size, args, results)
+
+    if args.output:
+        document = {
+            "commit": git_commit(),
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "store": type(api.flights).__name__,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "results": results
+        }
+        with open(args.output, "w") as file:
+            json.dump(document, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+import httpx
+from fastapi import FastAPI, HTTPException, Query, status
+
+from app import main as api
+from app.store import FlightExistsError
+
+def threadpool_app():
+    app = FastAPI()
+
+    @app.get("/flights/")
+    def list_flights(flight_status: Optional[str] = Query(None), departure_time: Optional[str] = Query(None)):
+        start, end = api.listing_window(flight_status, departure_time, None, None)
+        return [f.to_dict() for f in api.flights.departing_between(start, end, flight_status)]
+
+    @app.get("/gates/")
+    def list_gates():
+        occupants = api.flights.occupied_gates()
+        return [
+            {"gate": gate, "free": gate not in occupants, "flight_number": occupants.get(gate)}
+            for gate in api.valid_gates
+        ]
+
+    @app.put("/flights/")
+    def update_flight_status(flight_number: str = Query(...), flight_status: str = Query(...)):
+        try:
+            api.flights.transition(flight_number, flight_status, api.transition_error)
+        except Exception as error:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error))
+        return {"status": flight_status}
+
+    return app
+
+def preload(count):
+    api.flights.clear()
+    start = datetime.combine(datetime.now().date(), datetime.min.time())
+    api.flights.extend(
+        {
+            "flight_number": f"FL{i}",
+            "arrival": "Los Angeles",
+            "departure_time": start + timedelta(seconds=i % 86400),
+            "gate": api.valid_gates[i % len(api.valid_gates)],
+            "status": "Departed"
+        }
+        for i in range(count)
+    )
+    try:
+        api.flights.register(api.Flight(flight_number="BM1", arrival="Bogota", departure_time=start, gate="A1"))
+    except FlightExistsError:
+        pass
+
+def request_for(kind):
+    if kind == "list":
+        return lambda client: client.get("/flights/", params={"flight_status": "Scheduled"})
+    if kind == "gates":
+        return lambda client: client.get("/gates/")
+    return lambda client: client.put("/flights/", params={"flight_number": "BM1", "flight_status": "Scheduled"})
+
+async def run(app, kind, concurrency, total):
+    send = request_for(kind)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        remaining = iter(range(total))
+
+        async def worker():
+            for _ in remaining:
+                response = await send(client)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare async handlers with threadpool-dispatched handlers.")
+    parser.add_argument("--flights", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--kind", choices=["list", "gates", "transition"], nargs="+", default=["list", "gates", "transition"])
+    parser.add_argument("--json", action="store_true", help="print one JSON object per result")
+    args = parser.parse_args()
+
+    preload(args.flights)
+    modes = {"async": api.app, "threadpool": threadpool_app()}
+    for kind in args.kind:
+        for concurrency in args.concurrency:
+            for mode, app in modes.items():
+                throughput = asyncio.run(run(app, kind, concurrency, args.requests))
+                result = {"kind": kind, "mode": mode, "concurrency": concurrency, "requests_per_second": round(throughput, 1)}
+                if args.json:
+                    print(json.dumps(result))
+                else:
+                    print(f"{kind:<11} {mode:<11} concurrency={concurrency:<4} {throughput:10.1f} req/s")
+
+if __name__ == "__main__":
+    main()
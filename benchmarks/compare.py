@@ -0,0 +1,43 @@
+import argparse
+import json
+import sys
+
+def load(path):
+    with open(path) as file:
+        document = json.load(file)
+    results = {(r["mode"], r["size"], r["endpoint"], r["scenario"]): r for r in document["results"]}
+    return document, results
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files written by benchmarks.api.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative throughput drop or p99 growth")
+    args = parser.parse_args()
+
+    baseline_document, baseline = load(args.baseline)
+    candidate_document, candidate = load(args.candidate)
+    print(f"baseline  {baseline_document.get('commit')}  {baseline_document.get('created')}")
+    print(f"candidate {candidate_document.get('commit')}  {candidate_document.get('created')}")
+
+    regressions = 0
+    for key in sorted(baseline.keys() & candidate.keys()):
+        before, after = baseline[key], candidate[key]
+        throughput = after["throughput"] / before["throughput"] - 1
+        p99 = after["p99_ms"] / before["p99_ms"] - 1 if before["p99_ms"] else 0.0
+        regressed = throughput < -args.threshold or p99 > args.threshold
+        regressions += regressed
+        mode, size, endpoint, scenario = key
+        print(
+            f"{mode:<9} {size:>8} {endpoint:<20} {scenario:<12} "
+            f"throughput {throughput:+7.1%}  p99 {p99:+7.1%}{'  REGRESSION' if regressed else ''}"
+        )
+    for key in sorted(baseline.keys() ^ candidate.keys()):
+        print(f"{' '.join(map(str, key))} only in {'baseline' if key in baseline else 'candidate'}")
+
+    if regressions:
+        print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import argparse
+import sys
+import time
+from bisect import bisect
+from datetime import datetime, timedelta
+from itertools import accumulate, islice
+from random import Random
+
+import httpx
+
+from app.config import max_batch_size, valid_gates
+from app.journal import JournaledFlightStore
+from app.lifecycle import FlightStatus, codes, transition_error
+from app.sqlite_store import SQLiteFlightStore
+from app.store import FlightRecord
+
+airlines = ("AV", "LA", "CM", "UA", "AA", "DL", "IB", "AF", "KL", "JA")
+arrivals = (
+    "Bogota", "Medellin", "Cali", "Cartagena", "Lima", "Quito", "Panama City", "Mexico City",
+    "Miami", "New York", "Los Angeles", "Madrid", "Paris", "Amsterdam", "Sao Paulo", "Santiago"
+)
+
+inactive_weights = {FlightStatus.DEPARTED: 95, FlightStatus.CANCELLED: 5}
+active_weights = {
+    FlightStatus.SCHEDULED: 50,
+    FlightStatus.AWAITING_BOARDING: 15,
+    FlightStatus.BOARDING: 10,
+    FlightStatus.DEPARTING: 5,
+    FlightStatus.DELAYED: 20
+}
+transition_weights = {
+    FlightStatus.SCHEDULED: {FlightStatus.AWAITING_BOARDING: 85, FlightStatus.DELAYED: 12, FlightStatus.CANCELLED: 3},
+    FlightStatus.AWAITING_BOARDING: {FlightStatus.BOARDING: 88, FlightStatus.DELAYED: 10, FlightStatus.CANCELLED: 2},
+    FlightStatus.BOARDING: {FlightStatus.DEPARTING: 92, FlightStatus.DELAYED: 7, FlightStatus.CANCELLED: 1},
+    FlightStatus.DEPARTING: {FlightStatus.DEPARTED: 100},
+    FlightStatus.DELAYED: {FlightStatus.AWAITING_BOARDING: 60, FlightStatus.BOARDING: 30, FlightStatus.CANCELLED: 10}
+}
+
+def _table(weights):
+    total = sum(weights.values())
+    return [status.label for status in weights], [w / total for w in accumulate(weights.values())]
+
+_inactive = _table(inactive_weights)
+_active = _table(active_weights)
+_transitions = {status: _table(weights) for status, weights in transition_weights.items()}
+
+def generate_flights(count, seed=0, days=30, start=None, active=None, gates=None):
+    gates = list(gates or valid_gates)
+    active = len(gates) if active is None else active
+    if start is None:
+        start = datetime.combine(datetime.now().date(), datetime.min.time()) - timedelta(days=days - 1)
+    rng = Random(seed)
+    random = rng.random
+    slot = days * 86400 / max(count, 1)
+    first_active = count - active
+    inactive_statuses, inactive_bounds = _inactive
+    active_statuses, active_bounds = _active
+    gate_count = len(gates)
+    arrival_count = len(arrivals)
+    airline_count = len(airlines)
+    record = FlightRecord
+    delta = timedelta
+    for i in range(count):
+        if i < first_active:
+            flight_status = inactive_statuses[bisect(inactive_bounds, random())]
+            gate = gates[int(random() * gate_count)]
+        else:
+            flight_status = active_statuses[bisect(active_bounds, random())]
+            gate = gates[(i - first_active) % gate_count]
+        yield record(
+            f"{airlines[i % airline_count]}{i // airline_count + 1}",
+            arrivals[int(random() * arrival_count)],
+            start + delta(0, int((i + random()) * slot)),
+            gate,
+            flight_status
+        )
+
+def generate_transitions(flights, count=None, seed=0):
+    rng = Random(seed)
+    random = rng.random
+    pending = [
+        [flight["flight_number"], codes[flight["status"]]]
+        for flight in flights
+        if codes[flight["status"]] in _transitions
+    ]
+    produced = 0
+    while pending and (count is None or produced < count):
+        index = int(random() * len(pending))
+        entry = pending[index]
+        statuses, bounds = _transitions[entry[1]]
+        flight_status = statuses[bisect(bounds, random())]
+        entry[1] = codes[flight_status]
+        if entry[1] not in _transitions:
+            pending[index] = pending[-1]
+            pending.pop()
+        produced += 1
+        yield entry[0], flight_status
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def load(store, flights, chunk_size=max_batch_size):
+    loaded = 0
+    for chunk in chunks(flights, chunk_size):
+        store.extend(chunk)
+        loaded += len(chunk)
+    return loaded
+
+def apply_transitions(store, transitions):
+    for flight_number, flight_status in transitions:
+        store.transition(flight_number, flight_status, transition_error)
+
+def post_flights(client, flights, chunk_size=max_batch_size):
+    rejected = 0
+    for chunk in chunks(flights, chunk_size):
+        response = client.post(
+            "/flights/batch",
+            params={"atomic": "false"},
+            content=b"[" + b",".join(flight.to_json() for flight in chunk) + b"]",
+            headers={"content-type": "application/json"}
+        )
+        response.raise_for_status()
+        rejected += sum(result["status_code"] >= 400 for result in response.json())
+    return rejected
+
+def put_transitions(client, transitions, chunk_size=max_batch_size):
+    rejected = 0
+    for chunk in chunks(transitions, chunk_size):
+        response = client.put("/flights/batch", json=[
+            {"flight_number": flight_number, "flight_status": flight_status} for flight_number, flight_status in chunk
+        ])
+        response.raise_for_status()
+        rejected += sum(result["status_code"] >= 400 for result in response.json())
+    return rejected
+
+def collect_active(flights, active):
+    for flight in flights:
+        if codes[flight.status] in _transitions:
+            active.append(flight)
+        yield flight
+
+def write_lines(output, flights, transitions):
+    for flight in flights:
+        output.write(flight.to_json() + b"\n")
+    for flight_number, flight_status in transitions:
+        output.write(b'{"flight_number":"%s","flight_status":"%s"}\n' % (flight_number.encode(), flight_status.encode()))
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic flight schedule and status changes.")
+    parser.add_argument("count", type=int, help="number of flights")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--days", type=int, default=30, help="days the departures are spread over, ending today")
+    parser.add_argument("--active", type=int, help="flights not yet departed or cancelled (default: one per gate)")
+    parser.add_argument("--transitions", type=int, default=0, help="status changes to generate for the active flights")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="register the flights through the API at this base URL")
+    target.add_argument("--database", help="load the flights into this SQLite database")
+    target.add_argument("--data-dir", help="load the flights into a journaled store in this directory")
+    args = parser.parse_args()
+
+    active = []
+    flights = collect_active(generate_flights(args.count, args.seed, args.days, active=args.active), active)
+
+    def transitions():
+        return generate_transitions(active, args.transitions, args.seed) if args.transitions else ()
+
+    started = time.perf_counter()
+    if args.url:
+        with httpx.Client(base_url=args.url, timeout=None) as client:
+            rejected = post_flights(client, flights)
+            rejected += put_transitions(client, transitions())
+        print(f"{rejected} rejected", file=sys.stderr)
+    elif args.database:
+        store = SQLiteFlightStore(args.database)
+        load(store, flights)
+        apply_transitions(store, transitions())
+    elif args.data_dir:
+        store = JournaledFlightStore(args.data_dir)
+        load(store, flights)
+        apply_transitions(store, transitions())
+        store.durable().result()
+        store.close()
+    else:
+        write_lines(sys.stdout.buffer, flights, transitions())
+    print(f"generated {args.count} flights in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+import datetime as dt
+from app.async_store import AsyncFlightStore
+from app.journal import JournaledFlightStore
+from app.sqlite_store import SQLiteFlightStore
+from app.store import FlightStore
+
+def make_flight(flight_number, gate="A1", status="Scheduled"):
+    return {
+        "flight_number": flight_number,
+        "arrival": "Los Angeles",
+        "departure_time": dt.datetime(2023, 10, 1, 10, 0),
+        "gate": gate,
+        "status": status
+    }
+
+def current_thread():
+    return threading.current_thread()
+
+def test_memory_store_runs_on_event_loop():
+    store = AsyncFlightStore(FlightStore())
+    async def run():
+        return await store.read(current_thread), await store.write(current_thread)
+    assert asyncio.run(run()) == (threading.main_thread(), threading.main_thread())
+
+def test_sqlite_store_runs_in_worker_thread(tmp_path):
+    store = AsyncFlightStore(SQLiteFlightStore(str(tmp_path / "flights.db")))
+    async def run():
+        await store.write(store.store.append, make_flight("FL123"))
+        return await store.read(current_thread), await store.read(store.store.get, "FL123")
+    thread, flight = asyncio.run(run())
+    assert thread is not threading.main_thread()
+    assert flight.flight_number == "FL123"
+
+def test_concurrent_sqlite_writes(tmp_path):
+    store = AsyncFlightStore(SQLiteFlightStore(str(tmp_path / "flights.db")))
+    async def run():
+        await asyncio.gather(*(
+            store.write(store.store.append, make_flight(f"FL{100 + i}", status="Departed")) for i in range(50)
+        ))
+    asyncio.run(run())
+    assert len(store.store) == 50
+
+def test_journaled_write_waits_until_durable(tmp_path):
+    journaled = JournaledFlightStore(str(tmp_path))
+    store = AsyncFlightStore(journaled)
+    async def run():
+        await store.write(journaled.append, make_flight("FL123"))
+        return journaled.durable()
+    try:
+        assert asyncio.run(run()).done()
+    finally:
+        journaled.close()
+    with open(tmp_path / "journal.1.log") as file:
+        assert '"FL123"' in file.read()
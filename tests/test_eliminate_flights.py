@@ -81,3 +81,16 @@ def test_eliminate_flight_empty_flights(client):
     response = client.delete(f"/flights/?flight_number={flight_number}&reason=Test%20elimination")
     assert response.status_code == 404
     assert response.json() == {"detail": f"Flight {flight_number} not found"}
+
+def test_eliminate_registered_flight(client):
+    flight = {
+        "flight_number": "FL200",
+        "arrival": "Boston",
+        "departure_time": "2023-10-01T10:00:00Z",
+        "gate": "E5"
+    }
+    response = client.post("/flights/", json=flight)
+    assert response.status_code == 201
+    response = client.delete("/flights/?flight_number=FL200&reason=Test%20elimination")
+    assert response.status_code == 200
+    assert "FL200" not in flights
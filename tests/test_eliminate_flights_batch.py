@@ -0,0 +1,75 @@
+import pytest
+import datetime as dt
+from app.main import flights
+from app.main import deletion_log
+
+@pytest.fixture(autouse=True)
+def reset_flights():
+    flights.clear()
+    deletion_log.clear()
+    base = dt.datetime(2023, 10, 1, 8, 0)
+    for i in range(6):
+        flights.append({
+            "flight_number": f"FL{100 + i}",
+            "arrival": "Los Angeles",
+            "departure_time": base + dt.timedelta(days=i),
+            "gate": "A1",
+            "status": "Cancelled" if i % 2 else "Departed"
+        })
+
+def eliminate(client, body):
+    return client.request("DELETE", "/flights/batch", json=body)
+
+def test_eliminate_flights_by_number(client):
+    response = eliminate(client, {"reason": "End of season", "flight_numbers": ["FL100", "fl101", "FL999"]})
+    assert response.status_code == 200
+    assert response.json() == {
+        "message": "2 flights eliminated successfully",
+        "eliminated": ["FL100", "FL101"],
+        "not_found": ["FL999"]
+    }
+    assert [f["flight_number"] for f in flights] == ["FL102", "FL103", "FL104", "FL105"]
+    assert deletion_log == [
+        {"flight_number": "FL100", "reason": "End of season"},
+        {"flight_number": "FL101", "reason": "End of season"}
+    ]
+
+def test_eliminate_flights_by_filter(client):
+    response = eliminate(client, {"reason": "End of season", "flight_status": "Cancelled", "to": "2023-10-04"})
+    assert response.status_code == 200
+    assert response.json()["eliminated"] == ["FL101", "FL103"]
+    assert len(flights) == 4
+    assert len(deletion_log) == 2
+
+def test_eliminate_flights_by_range(client):
+    response = eliminate(client, {"reason": "End of season", "from": "2023-10-02", "to": "2023-10-05"})
+    assert response.json()["eliminated"] == ["FL101", "FL102", "FL103", "FL104"]
+    assert [f["flight_number"] for f in flights.departing_between()] == ["FL100", "FL105"]
+
+def test_eliminate_flights_no_reason(client):
+    response = eliminate(client, {"flight_numbers": ["FL100"]})
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Reason for elimination is required"}
+    assert len(flights) == 6
+
+def test_eliminate_flights_no_selection(client):
+    response = eliminate(client, {"reason": "End of season"})
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Flight numbers or a filter are required"}
+    assert len(flights) == 6
+
+def test_eliminate_flights_numbers_and_filter(client):
+    response = eliminate(client, {"reason": "End of season", "flight_numbers": ["FL100"], "flight_status": "Departed"})
+    assert response.status_code == 422
+    assert len(flights) == 6
+
+def test_eliminate_flights_invalid_flight_number(client):
+    response = eliminate(client, {"reason": "End of season", "flight_numbers": ["FL100", "FL#101"]})
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Invalid flight number format"}
+    assert len(flights) == 6
+
+def test_eliminate_flights_invalid_filter(client):
+    response = eliminate(client, {"reason": "End of season", "flight_status": "InvalidStatus"})
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Invalid status filter"}
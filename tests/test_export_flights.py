@@ -0,0 +1,58 @@
+import pytest
+import json
+import datetime as dt
+from app import main
+from app.main import flights
+
+@pytest.fixture(autouse=True)
+def reset_flights():
+    flights.clear()
+    base = dt.datetime(2023, 10, 1, 8, 0)
+    for i in range(5):
+        flights.append({
+            "flight_number": f"FL{100 + i}",
+            "arrival": "Los Angeles",
+            "departure_time": base + dt.timedelta(days=i),
+            "gate": "A1",
+            "status": "Cancelled" if i % 2 else "Departed"
+        })
+
+def exported(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def test_export_flights(client):
+    response = client.get("/flights/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = exported(response)
+    assert [flight["flight_number"] for flight in lines] == [f"FL{100 + i}" for i in range(5)]
+    assert lines[0] == {
+        "flight_number": "FL100",
+        "arrival": "Los Angeles",
+        "departure_time": "2023-10-01T08:00:00",
+        "gate": "A1",
+        "status": "Departed"
+    }
+
+def test_export_flights_in_chunks(client, monkeypatch):
+    monkeypatch.setattr(main, "export_chunk_size", 2)
+    response = client.get("/flights/export")
+    assert [flight["flight_number"] for flight in exported(response)] == [f"FL{100 + i}" for i in range(5)]
+
+def test_export_flights_with_filters(client):
+    response = client.get("/flights/export?flight_status=Cancelled")
+    assert [flight["flight_number"] for flight in exported(response)] == ["FL101", "FL103"]
+
+    response = client.get("/flights/export?from=2023-10-02&to=2023-10-03")
+    assert [flight["flight_number"] for flight in exported(response)] == ["FL101", "FL102"]
+
+def test_export_flights_empty(client):
+    flights.clear()
+    response = client.get("/flights/export")
+    assert response.status_code == 200
+    assert response.text == ""
+
+def test_export_flights_invalid_filter(client):
+    response = client.get("/flights/export?flight_status=InvalidStatus")
+    assert response.status_code == 422
+    assert "detail" in response.json()
@@ -0,0 +1,375 @@
+import pytest
+import threading
+import datetime as dt
+from app.store import (
+    FlightExistsError,
+    FlightNotFoundError,
+    FlightRecord,
+    FlightStore,
+    GateInUseError,
+    InvalidTransitionError,
+    departure_key
+)
+from app.sqlite_store import SQLiteFlightStore
+
+@pytest.fixture(params=["memory", "sqlite"])
+def empty_store(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteFlightStore(str(tmp_path / "flights.db"))
+    return FlightStore()
+
+@pytest.fixture
+def store(empty_store):
+    store = empty_store
+    store.append({
+        "flight_number": "FL123",
+        "arrival": "Los Angeles",
+        "departure_time": dt.datetime.now(),
+        "gate": "A1",
+        "status": "Scheduled"
+    })
+    store.append({
+        "flight_number": "FL124",
+        "arrival": "New York",
+        "departure_time": dt.datetime.now(),
+        "gate": "B2",
+        "status": "Scheduled"
+    })
+    return store
+
+def test_get_by_flight_number(store):
+    assert store.get("FL123")["arrival"] == "Los Angeles"
+    assert store.get("fl124")["arrival"] == "New York"
+    assert store.get("FL999") is None
+
+def test_contains(store):
+    assert "FL123" in store
+    assert "fl123" in store
+    assert "FL999" not in store
+
+def test_delete(store):
+    assert store.delete("FL123")["flight_number"] == "FL123"
+    assert store.delete("FL123") is None
+    assert len(store) == 1
+    assert [f["flight_number"] for f in store] == ["FL124"]
+
+def test_clear(store):
+    store.clear()
+    assert len(store) == 0
+    assert list(store) == []
+
+def test_departing_between(empty_store):
+    store = empty_store
+    base = dt.datetime(2023, 10, 1, 12, 0)
+    for i, hours in enumerate([30, -2, 5, 0, 48]):
+        store.append({
+            "flight_number": f"FL{100 + i}",
+            "arrival": "Los Angeles",
+            "departure_time": base + dt.timedelta(hours=hours),
+            "gate": "A1",
+            "status": "Departed"
+        })
+    day = [f["flight_number"] for f in store.departing_on(base.date())]
+    assert day == ["FL101", "FL103", "FL102"]
+    window = store.departing_between(base, base + dt.timedelta(hours=30))
+    assert [f["flight_number"] for f in window] == ["FL103", "FL102"]
+
+    store.delete("FL103")
+    assert [f["flight_number"] for f in store.departing_on(base.date())] == ["FL101", "FL102"]
+
+def test_departing_on_ignores_timezone(empty_store):
+    store = empty_store
+    store.append({
+        "flight_number": "FL123",
+        "arrival": "Los Angeles",
+        "departure_time": dt.datetime(2023, 10, 1, 23, 30, tzinfo=dt.timezone(dt.timedelta(hours=-5))),
+        "gate": "A1",
+        "status": "Scheduled"
+    })
+    assert len(store.departing_on(dt.date(2023, 10, 1))) == 1
+    assert store.departing_on(dt.date(2023, 10, 2)) == []
+
+def test_with_status(store):
+    assert [f["flight_number"] for f in store.with_status("Scheduled")] == ["FL123", "FL124"]
+    store.set_status("FL123", "Boarding")
+    assert [f["flight_number"] for f in store.with_status("Scheduled")] == ["FL124"]
+    assert [f["flight_number"] for f in store.with_status("Boarding")] == ["FL123"]
+    store.delete("FL124")
+    assert store.with_status("Scheduled") == []
+    assert store.with_status("Departed") == []
+
+def test_departing_between_with_status(empty_store):
+    store = empty_store
+    base = dt.datetime(2023, 10, 1, 12, 0)
+    for i in range(10):
+        store.append({
+            "flight_number": f"FL{100 + i}",
+            "arrival": "Los Angeles",
+            "departure_time": base + dt.timedelta(hours=6 * i),
+            "gate": "A1",
+            "status": "Boarding" if i % 4 == 0 else "Departed"
+        })
+    boarding = store.departing_between(base, base + dt.timedelta(days=2), "Boarding")
+    assert [f["flight_number"] for f in boarding] == ["FL100", "FL104"]
+    departed = store.departing_on(base.date(), "Departed")
+    assert [f["flight_number"] for f in departed] == ["FL101"]
+
+def test_status_page_reads_only_one_page(monkeypatch):
+    store = FlightStore()
+    base = dt.datetime(2023, 10, 1, 12, 0)
+    store.extend(
+        FlightRecord(f"FL{i}", "Los Angeles", base + dt.timedelta(minutes=i), "A1", "Scheduled" if i % 10 == 0 else "Departed")
+        for i in range(10000)
+    )
+    calls = []
+    def counting_departure_key(departure_time):
+        calls.append(departure_time)
+        return departure_key(departure_time)
+    monkeypatch.setattr("app.store.departure_key", counting_departure_key)
+    page = store.departing_between(None, None, "Departed", None, 101)
+    assert [f.flight_number for f in page[:3]] == ["FL1", "FL2", "FL3"]
+    assert len(page) == 101
+    assert len(calls) == 0
+
+def test_status_pages_follow_changes(empty_store):
+    store = empty_store
+    base = dt.datetime(2023, 10, 1, 12, 0)
+    store.extend(
+        FlightRecord(f"FL{i}", "Los Angeles", base + dt.timedelta(minutes=i % 50), "A1", "Departed" if i % 3 else "Cancelled")
+        for i in range(300)
+    )
+    for i in range(0, 300, 7):
+        store.set_status(f"FL{i}", "Delayed")
+    store.delete_many([f"FL{i}" for i in range(0, 300, 11)])
+    store.delete_many([f"FL{i}" for i in range(1, 300, 2)])
+    store.append(FlightRecord("FL999", "Los Angeles", base, "B2", "Delayed"))
+
+    for status in ["Departed", "Cancelled", "Delayed"]:
+        expected = sorted(
+            (f for f in store if f.status == status),
+            key=lambda f: (f.departure_time, f.flight_number.upper())
+        )
+        pages, after = [], None
+        while True:
+            page = store.departing_between(None, None, status, after, 10)
+            if not page:
+                break
+            pages.extend(page)
+            after = store.position(page[-1])
+        assert [f.flight_number for f in pages] == [f.flight_number for f in expected]
+
+def test_append_converts_to_record(store):
+    record = store.get("FL123")
+    assert isinstance(record, FlightRecord)
+    assert record.gate == "A1"
+    assert record["status"] == "Scheduled"
+    with pytest.raises(KeyError):
+        record["unknown"]
+    assert set(record.to_dict()) == {"flight_number", "arrival", "departure_time", "gate", "status"}
+
+def test_to_json_follows_status_changes(store):
+    flight = store.get("FL123")
+    assert flight.to_json() is flight.to_json()
+    assert b'"status":"Scheduled"' in flight.to_json()
+    store.set_status("FL123", "Delayed")
+    assert b'"status":"Delayed"' in store.get("FL123").to_json()
+
+def test_to_json_matches_api_encoding():
+    departure_time = dt.datetime(2023, 10, 1, 10, 0, 0, 120000, tzinfo=dt.timezone.utc)
+    flight = FlightRecord("FL123", "Bogotá", departure_time, "A1")
+    assert flight.to_json() == (
+        '{"flight_number":"FL123","arrival":"Bogotá","departure_time":"2023-10-01T10:00:00.120000Z",'
+        '"gate":"A1","status":"Scheduled"}'
+    ).encode()
+
+def test_extend(store):
+    base = dt.datetime(2023, 10, 1, 12, 0)
+    store.extend([
+        {"flight_number": "FL200", "arrival": "Boston", "departure_time": base, "gate": "C3", "status": "Scheduled"},
+        {"flight_number": "FL201", "arrival": "Boston", "departure_time": base - dt.timedelta(hours=1), "gate": "D4", "status": "Cancelled"}
+    ])
+    assert len(store) == 4
+    assert [f["flight_number"] for f in store.departing_on(base.date())] == ["FL201", "FL200"]
+    assert store.gate_occupant("C3") == "FL200"
+    assert store.gate_occupant("D4") is None
+
+def test_shared_gate_stays_occupied_until_every_flight_leaves(store):
+    base = dt.datetime(2023, 10, 1, 12, 0)
+    store.extend([
+        {"flight_number": "FL200", "arrival": "Boston", "departure_time": base, "gate": "C3", "status": "Scheduled"},
+        {"flight_number": "FL201", "arrival": "Boston", "departure_time": base, "gate": "C3", "status": "Boarding"}
+    ])
+    assert store.gate_occupant("C3") == "FL200"
+    store.set_status("FL200", "Departed")
+    assert store.gate_occupant("C3") == "FL201"
+    assert store.occupied_gates()["C3"] == "FL201"
+    store.delete("FL201")
+    assert store.gate_occupant("C3") is None
+    assert "C3" not in store.occupied_gates()
+
+@pytest.mark.parametrize("count", [10, 200])
+def test_delete_many(empty_store, count):
+    store = empty_store
+    base = dt.datetime(2023, 10, 1, 12, 0)
+    store.extend({
+        "flight_number": f"FL{1000 + i}",
+        "arrival": "Los Angeles",
+        "departure_time": base + dt.timedelta(minutes=i),
+        "gate": "A1",
+        "status": "Departed"
+    } for i in range(count))
+    removed = store.delete_many(f"FL{1000 + i}" for i in range(0, count, 2))
+    assert len(removed) == count // 2
+    assert len(store) == count // 2
+    assert [f.flight_number for f in store.departing_between()] == [f"FL{1000 + i}" for i in range(1, count, 2)]
+    assert len(store.with_status("Departed")) == count // 2
+
+def test_sqlite_store_survives_restart(tmp_path):
+    path = str(tmp_path / "flights.db")
+    store = SQLiteFlightStore(path)
+    store.append({
+        "flight_number": "FL123",
+        "arrival": "Los Angeles",
+        "departure_time": dt.datetime(2023, 10, 1, 10, 0, tzinfo=dt.timezone.utc),
+        "gate": "A1",
+        "status": "Scheduled"
+    })
+    store.set_status("FL123", "Boarding")
+    store.deletion_log.append({"flight_number": "FL100", "reason": "Test elimination"})
+
+    reopened = SQLiteFlightStore(path)
+    flight = reopened.get("FL123")
+    assert flight.status == "Boarding"
+    assert flight.departure_time == dt.datetime(2023, 10, 1, 10, 0, tzinfo=dt.timezone.utc)
+    assert reopened.gate_occupant("A1") == "FL123"
+    assert reopened.deletion_log == [{"flight_number": "FL100", "reason": "Test elimination"}]
+
+def test_register(empty_store):
+    flight = FlightRecord("FL123", "Los Angeles", dt.datetime(2023, 10, 1, 10, 0), "A1")
+    empty_store.register(flight)
+    with pytest.raises(FlightExistsError):
+        empty_store.register(flight.replace(gate="B2"))
+    with pytest.raises(GateInUseError):
+        empty_store.register(flight.replace(flight_number="FL124"))
+    empty_store.register(flight.replace(flight_number="FL125", gate="B2"))
+    assert len(empty_store) == 2
+
+def test_transition(store):
+    def validate(current, target):
+        return "Cancelled flights cannot be rescheduled" if current == "Cancelled" else None
+
+    before = store.get("FL123")
+    previous, after = store.transition("FL123", "Cancelled", validate)
+    assert previous == "Scheduled"
+    assert after.status == "Cancelled"
+    assert before.status == "Scheduled"
+    with pytest.raises(InvalidTransitionError, match="Cancelled flights cannot be rescheduled"):
+        store.transition("FL123", "Scheduled", validate)
+    with pytest.raises(FlightNotFoundError):
+        store.transition("FL999", "Scheduled", validate)
+    assert store.get("FL123").status == "Cancelled"
+
+def test_version_changes_on_every_mutation(store):
+    versions = [store.version()]
+    store.set_status("FL123", "Delayed")
+    versions.append(store.version())
+    store.delete("FL124")
+    versions.append(store.version())
+    store.clear()
+    versions.append(store.version())
+    assert len(set(versions)) == 4
+    assert store.get("FL999") is None
+    assert store.version() == versions[-1]
+
+def test_changes_since(store):
+    since = store.last_sequence()
+    store.set_status("FL123", "Delayed")
+    store.delete_many(["FL124", "FL999"])
+    store.deletion_log.append({"flight_number": "FL124", "reason": "Weather"})
+    store.clear()
+    store.deletion_log.clear()
+
+    changes = store.changes_since(since)
+    assert [(sequence - since, op) for sequence, op, _ in changes] == [
+        (1, "upsert"), (2, "delete"), (3, "log"), (4, "clear"), (5, "clear_log")
+    ]
+    assert changes[0][2].status == "Delayed"
+    assert changes[1][2] == "FL124"
+    assert changes[2][2] == {"flight_number": "FL124", "reason": "Weather"}
+    assert store.last_sequence() == since + 5
+    assert store.changes_since(since + 1, limit=1) == changes[1:2]
+    assert store.changes_since(since + 5) == []
+    assert store.changes_since(since + 6) is None
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_changes_since_keeps_bounded_history(kind, tmp_path):
+    store = SQLiteFlightStore(str(tmp_path / "flights.db"), change_history=3) if kind == "sqlite" else FlightStore(change_history=3)
+    since = store.last_sequence()
+    for i in range(5):
+        store.append(FlightRecord(f"FL{100 + i}", "Los Angeles", dt.datetime(2023, 10, 1, 10, 0), "A1", "Departed"))
+    assert store.changes_since(since) is None
+    assert store.changes_since(since + 1) is None
+    assert [flight.flight_number for _, _, flight in store.changes_since(since + 2)] == ["FL102", "FL103", "FL104"]
+
+def test_sequence_fits_in_a_double(store):
+    assert store.last_sequence() <= 2 ** 53 - 1
+    assert store.version() <= 2 ** 53 - 1
+
+def test_sqlite_resets_oversized_sequence(tmp_path):
+    path = str(tmp_path / "flights.db")
+    store = SQLiteFlightStore(path)
+    with store.transaction() as connection:
+        connection.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'changes'", (2 ** 60,))
+        connection.execute("UPDATE store_version SET version = ?", (2 ** 60,))
+    store = SQLiteFlightStore(path)
+    assert store.last_sequence() <= 2 ** 53 - 1
+    assert store.version() <= 2 ** 53 - 1
+    since = store.last_sequence()
+    store.append(FlightRecord("FL123", "Los Angeles", dt.datetime(2023, 10, 1, 10, 0), "A1"))
+    assert [sequence for sequence, _, _ in store.changes_since(since)] == [since + 1]
+
+def test_sqlite_transaction_rolls_back_on_error(tmp_path):
+    store = SQLiteFlightStore(str(tmp_path / "flights.db"))
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.append(FlightRecord("FL123", "Los Angeles", dt.datetime(2023, 10, 1, 10, 0), "A1"))
+            raise RuntimeError("abort")
+    assert len(store) == 0
+
+def test_concurrent_registration_on_one_gate(empty_store):
+    barrier = threading.Barrier(8)
+    registered = []
+    def register(i):
+        barrier.wait()
+        try:
+            empty_store.register(FlightRecord(f"FL{100 + i}", "Los Angeles", dt.datetime(2023, 10, 1, 10, 0), "A1"))
+            registered.append(i)
+        except GateInUseError:
+            pass
+    threads = [threading.Thread(target=register, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(registered) == 1
+    assert len(empty_store) == 1
+
+def test_concurrent_reads_and_deletes():
+    store = FlightStore()
+    base = dt.datetime(2023, 10, 1, 12, 0)
+    store.extend(FlightRecord(f"FL{1000 + i}", "Los Angeles", base + dt.timedelta(minutes=i), "A1", "Departed") for i in range(2000))
+    errors = []
+    def read():
+        try:
+            for _ in range(200):
+                for flight in store.with_status("Departed"):
+                    assert flight.status == "Departed"
+                store.departing_on(base.date(), "Departed")
+        except Exception as error:
+            errors.append(error)
+    reader = threading.Thread(target=read)
+    reader.start()
+    for i in range(2000):
+        store.delete(f"FL{1000 + i}")
+    reader.join()
+    assert errors == []
@@ -0,0 +1,171 @@
+import pytest
+import json
+import asyncio
+import datetime as dt
+import httpx
+from app.main import app, events, flights, stream_filter
+from app.events import EventBroker
+
+@pytest.fixture(autouse=True)
+def reset_flights():
+    flights.clear()
+    flights.append({
+        "flight_number": "FL123",
+        "arrival": "Los Angeles",
+        "departure_time": dt.datetime(2023, 10, 1, 10, 0),
+        "gate": "A1",
+        "status": "Scheduled"
+    })
+
+@pytest.fixture
+def subscribe():
+    subscriptions = []
+    def subscribe(matches=None):
+        subscription = events.subscribe(matches)
+        subscriptions.append(subscription)
+        return subscription
+    yield subscribe
+    for subscription in subscriptions:
+        events.unsubscribe(subscription)
+
+def received(subscription):
+    messages = []
+    while not subscription.queue.empty():
+        for message in subscription.queue.get_nowait().strip().split("\n\n"):
+            event, data = message.split("\n")
+            messages.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return messages
+
+def test_stream_register_transition_and_eliminate(client, subscribe):
+    subscription = subscribe()
+    client.post("/flights/", json={
+        "flight_number": "FL124",
+        "arrival": "New York",
+        "departure_time": "2023-10-01T12:00:00",
+        "gate": "B2",
+        "status": "Scheduled"
+    })
+    client.put("/flights/?flight_number=FL123&flight_status=Delayed")
+    client.delete("/flights/?flight_number=FL124&reason=Weather")
+    messages = received(subscription)
+    assert [(event, data["flight_number"], data["status"]) for event, data in messages] == [
+        ("register", "FL124", "Scheduled"),
+        ("transition", "FL123", "Delayed"),
+        ("eliminate", "FL124", "Scheduled")
+    ]
+    assert messages[2][1]["reason"] == "Weather"
+    assert messages[0][1]["departure_time"] == "2023-10-01T12:00:00"
+
+def test_stream_batch_events(client, subscribe):
+    subscription = subscribe()
+    client.put("/flights/batch", json=[{"flight_number": "FL123", "flight_status": "Cancelled"}])
+    client.request("DELETE", "/flights/batch", json={"reason": "End of season", "flight_numbers": ["FL123"]})
+    assert [event for event, _ in received(subscription)] == ["transition", "eliminate"]
+
+def test_batch_larger_than_queue_keeps_subscribers(client, subscribe):
+    subscription = subscribe()
+    filtered = subscribe(stream_filter(None, "B2", None))
+    batch = [
+        {
+            "flight_number": f"FL{200 + i}",
+            "arrival": "Boston",
+            "departure_time": "2023-10-01T12:00:00",
+            "gate": "C3",
+            "status": "Departed"
+        }
+        for i in range(events.queue_size + 500)
+    ]
+    client.post("/flights/batch", json=batch)
+    client.request("DELETE", "/flights/batch", json={"reason": "End of season", "flight_status": "Departed"})
+    assert not subscription.overflowed
+    assert len(events) == 2
+    messages = received(subscription)
+    assert len(messages) == 2 * len(batch)
+    assert [event for event, _ in messages[::len(batch)]] == ["register", "eliminate"]
+    assert messages[-1][1]["reason"] == "End of season"
+    assert received(filtered) == []
+
+def test_stream_filter():
+    flight = flights.get("FL123")
+    assert stream_filter(None, None, None) is None
+    assert stream_filter("Scheduled", "A1", dt.date(2023, 10, 1))(flight)
+    assert not stream_filter("Delayed", None, None)(flight)
+    assert not stream_filter(None, "B2", None)(flight)
+    assert not stream_filter(None, None, dt.date(2023, 10, 2))(flight)
+
+def test_stream_filter_applies_to_subscription(client, subscribe):
+    subscription = subscribe(stream_filter(None, "B2", None))
+    client.put("/flights/?flight_number=FL123&flight_status=Delayed")
+    assert received(subscription) == []
+
+def test_stream_endpoint_sends_matching_events():
+    async def read_stream():
+        subscribers = len(events)
+        body = []
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+
+        scope = {
+            "type": "http",
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/flights/stream",
+            "raw_path": b"/flights/stream",
+            "root_path": "",
+            "query_string": b"gate=A1&departure_time=2023-10-01",
+            "headers": [],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80)
+        }
+        stream = asyncio.create_task(app(scope, receive, send))
+        while len(events) == subscribers:
+            await asyncio.sleep(0.01)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            await client.post("/flights/", json={
+                "flight_number": "FL124",
+                "arrival": "New York",
+                "departure_time": "2023-10-01T12:00:00",
+                "gate": "B2",
+                "status": "Scheduled"
+            })
+            await client.put("/flights/?flight_number=FL123&flight_status=Delayed")
+        while not any(chunk.startswith(b"event:") for chunk in body):
+            await asyncio.sleep(0.01)
+        disconnected.set()
+        await asyncio.wait_for(stream, 5)
+        return b"".join(body).decode()
+
+    event, data = asyncio.run(asyncio.wait_for(read_stream(), 10)).strip().split("\n")
+    assert event == "event: transition"
+    assert json.loads(data[len("data: "):])["flight_number"] == "FL123"
+    assert len(events) == 0
+
+def test_stream_rejects_invalid_filters(client):
+    assert client.get("/flights/stream?flight_status=Unknown").json() == {"detail": "Invalid status filter"}
+    assert client.get("/flights/stream?gate=Z9").json() == {"detail": "Invalid gate filter"}
+    assert client.get("/flights/stream?departure_time=invalid").json() == {"detail": "Invalid departure_time filter"}
+
+def test_slow_subscriber_is_dropped():
+    broker = EventBroker(2, lambda flight, extra: flight)
+    subscription = broker.subscribe()
+    for flight_number in ["FL1", "FL2", "FL3"]:
+        broker.publish("register", flight_number)
+    assert len(broker) == 0
+
+    async def read_all():
+        return [message async for message in broker.stream(subscription, 1)]
+    assert asyncio.run(read_all()) == [
+        "event: register\ndata: FL1\n\n",
+        "event: register\ndata: FL2\n\n",
+        "event: overflow\ndata: {}\n\n"
+    ]
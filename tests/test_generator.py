@@ -0,0 +1,70 @@
+import pytest
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from app.lifecycle import can_transition
+from app.main import flight_number_is_valid, flights, valid_gates, valid_statuses
+from app.store import FlightStore, inactive_statuses
+from benchmarks.generator import generate_flights, generate_transitions, load, post_flights, put_transitions
+
+@pytest.fixture(autouse=True)
+def reset_flights():
+    flights.clear()
+
+def test_generate_flights_is_seeded():
+    first = [flight.to_dict() for flight in generate_flights(100, seed=1)]
+    assert first == [flight.to_dict() for flight in generate_flights(100, seed=1)]
+    assert first != [flight.to_dict() for flight in generate_flights(100, seed=2)]
+
+def test_generated_flights_are_valid():
+    start = datetime(2024, 1, 1)
+    generated = list(generate_flights(5000, seed=3, days=10, start=start))
+    assert len({flight.flight_number for flight in generated}) == 5000
+    assert all(flight_number_is_valid(flight.flight_number) for flight in generated)
+    assert all(flight.gate in valid_gates for flight in generated)
+    assert all(flight.status in valid_statuses for flight in generated)
+    departures = [flight.departure_time for flight in generated]
+    assert departures == sorted(departures)
+    assert start <= departures[0] and departures[-1] < start + timedelta(days=10)
+    assert len({departure.date() for departure in departures}) == 10
+
+def test_generated_flights_keep_one_active_flight_per_gate():
+    generated = list(generate_flights(1000, seed=4))
+    active = [flight for flight in generated if flight.status not in inactive_statuses]
+    assert len(active) == len(valid_gates)
+    assert sorted(flight.gate for flight in active) == sorted(valid_gates)
+    assert {flight.status for flight in generated} >= set(inactive_statuses)
+
+def test_generated_flights_load_into_store():
+    store = FlightStore()
+    assert load(store, generate_flights(2500, seed=5), chunk_size=1000) == 2500
+    assert len(store) == 2500
+
+def test_generated_flights_register_through_api(client):
+    assert post_flights(client, generate_flights(300, seed=6), chunk_size=100) == 0
+    assert len(flights) == 300
+
+def test_generated_transitions_follow_lifecycle():
+    generated = list(generate_flights(50, seed=7, active=50))
+    statuses = {flight.flight_number: flight.status for flight in generated}
+    transitions = list(generate_transitions(generated, seed=7))
+    assert transitions
+    for flight_number, flight_status in transitions:
+        assert flight_status != statuses[flight_number]
+        assert can_transition(statuses[flight_number], flight_status)
+        statuses[flight_number] = flight_status
+    assert set(statuses.values()) <= set(inactive_statuses)
+
+def test_generated_transitions_are_limited():
+    generated = list(generate_flights(50, seed=8, active=50))
+    assert len(list(generate_transitions(generated, count=10, seed=8))) == 10
+
+def test_generated_transitions_apply_through_api(client):
+    generated = list(generate_flights(100, seed=9))
+    post_flights(client, generated)
+    assert put_transitions(client, generate_transitions(generated, seed=9), chunk_size=3) == 0
+    assert all(flight.status in inactive_statuses for flight in flights)
+
+def test_generator_does_not_open_the_api_store():
+    code = "import sys, benchmarks.generator; sys.exit('app.main' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
@@ -0,0 +1,151 @@
+import pytest
+import os
+import threading
+import datetime as dt
+from app.journal import JournaledFlightStore
+
+def make_flight(flight_number, gate="A1", status="Scheduled"):
+    return {
+        "flight_number": flight_number,
+        "arrival": "Los Angeles",
+        "departure_time": dt.datetime(2023, 10, 1, 10, 0, tzinfo=dt.timezone.utc),
+        "gate": gate,
+        "status": status
+    }
+
+@pytest.fixture
+def open_store(tmp_path):
+    stores = []
+    def open_store(**kwargs):
+        store = JournaledFlightStore(str(tmp_path), **kwargs)
+        stores.append(store)
+        return store
+    yield open_store
+    for store in stores:
+        store.close()
+
+def test_replay_journal(open_store):
+    store = open_store()
+    store.append(make_flight("FL123"))
+    store.extend([make_flight("FL124", "B2"), make_flight("FL125", "C3")])
+    store.set_status("FL123", "Boarding")
+    store.delete("FL124")
+    store.deletion_log.append({"flight_number": "FL124", "reason": "Test elimination"})
+    store.close()
+
+    store = open_store()
+    assert [f.flight_number for f in store] == ["FL123", "FL125"]
+    assert store.get("FL123").status == "Boarding"
+    assert store.get("FL123").departure_time == dt.datetime(2023, 10, 1, 10, 0, tzinfo=dt.timezone.utc)
+    assert store.gate_occupant("A1") == "FL123"
+    assert store.gate_occupant("B2") is None
+    assert store.deletion_log == [{"flight_number": "FL124", "reason": "Test elimination"}]
+
+def test_replay_status_change_by_lowercase_number(open_store):
+    store = open_store()
+    store.append(make_flight("FL123"))
+    store.set_status("fl123", "Delayed")
+    store.close()
+
+    store = open_store()
+    assert store.get("FL123").status == "Delayed"
+
+def test_snapshot_truncates_journal(open_store, tmp_path):
+    store = open_store()
+    for i in range(5):
+        store.append(make_flight(f"FL{100 + i}", status="Departed"))
+    store.deletion_log.append({"flight_number": "FL099", "reason": "Test elimination"})
+    store.snapshot()
+    store.delete("FL100")
+    store.close()
+
+    assert sorted(os.listdir(tmp_path)) == ["journal.2.log", "snapshot.2.bin"]
+    store = open_store()
+    assert [f.flight_number for f in store] == ["FL101", "FL102", "FL103", "FL104"]
+    assert len(store.deletion_log) == 1
+
+def test_snapshot_failure_is_reported(open_store, tmp_path, monkeypatch, caplog):
+    store = open_store()
+    store.append(make_flight("FL123"))
+    def fail(*args):
+        raise ValueError("disk full")
+    monkeypatch.setattr(store._journal, "write_snapshot", fail)
+    with pytest.raises(ValueError):
+        store.snapshot()
+    assert isinstance(store.snapshot_error, ValueError)
+    assert "Writing snapshot" in caplog.text
+    store.close()
+
+    store = open_store()
+    assert [f.flight_number for f in store] == ["FL123"]
+
+class BrokenFile:
+    def write(self, line):
+        raise OSError("disk full")
+
+    def close(self):
+        pass
+
+def test_write_failure_fails_journal(open_store, caplog):
+    store = open_store()
+    store.append(make_flight("FL123"))
+    store.durable().result()
+    store._journal._file = BrokenFile()
+    store.append(make_flight("FL124", "B2"))
+    with pytest.raises(OSError):
+        store.durable().result(timeout=5)
+    with pytest.raises(RuntimeError):
+        store.append(make_flight("FL125", "C3"))
+    assert "Writing journal" in caplog.text
+    store.close()
+
+    store = open_store()
+    assert [f.flight_number for f in store] == ["FL123"]
+
+def test_rotation_failure_fails_journal(open_store, monkeypatch):
+    store = open_store()
+    store.append(make_flight("FL123"))
+    store.durable().result()
+    def fail(*args, **kwargs):
+        raise OSError("too many open files")
+    monkeypatch.setattr("app.journal.open", fail, raising=False)
+    store._journal.rotate()
+    store._journal._thread.join(timeout=5)
+    monkeypatch.undo()
+    with pytest.raises(RuntimeError):
+        store.append(make_flight("FL124", "B2"))
+
+def test_periodic_snapshot(open_store, tmp_path):
+    store = open_store(snapshot_every=10)
+    for i in range(25):
+        store.append(make_flight(f"FL{100 + i}", status="Departed"))
+    store.close()
+
+    assert len([name for name in os.listdir(tmp_path) if name.startswith("snapshot.")]) == 1
+    store = open_store()
+    assert len(store) == 25
+
+def test_ignores_torn_last_line(open_store, tmp_path):
+    store = open_store()
+    store.append(make_flight("FL123"))
+    store.close()
+    with open(tmp_path / "journal.1.log", "a") as file:
+        file.write('{"op": "append", "fli')
+
+    store = open_store()
+    assert [f.flight_number for f in store] == ["FL123"]
+
+def test_concurrent_writers(open_store):
+    store = open_store()
+    def register(offset):
+        for i in range(50):
+            store.append(make_flight(f"FL{offset + i}", status="Departed"))
+    threads = [threading.Thread(target=register, args=(1000 * n,)) for n in range(1, 5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.close()
+
+    store = open_store()
+    assert len(store) == 200
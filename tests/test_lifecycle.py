@@ -0,0 +1,23 @@
+from app.lifecycle import FlightStatus, can_transition, codes, labels, transition_error, transition_matrix
+
+def test_codes_match_labels():
+    assert [codes[label] for label in labels] == list(FlightStatus)
+    assert FlightStatus.AWAITING_BOARDING.label == "Awaiting Boarding"
+
+def test_every_status_may_stay_unchanged():
+    for status in FlightStatus:
+        assert transition_matrix[status][status]
+
+def test_rejected_transitions_have_an_error():
+    for current in labels:
+        for target in labels:
+            assert (transition_error(current, target) is None) == can_transition(current, target)
+
+def test_transition_errors():
+    assert transition_error("Scheduled", "Awaiting Boarding") is None
+    assert transition_error("Delayed", "Boarding") is None
+    assert transition_error("Scheduled", "Boarding") == "Flight was not in Awaiting Boarding status"
+    assert transition_error("Delayed", "Scheduled") == "Flight was not in Scheduled status"
+    assert transition_error("Departing", "Delayed") == "Flight cannot be delayed after departing"
+    assert transition_error("Departed", "Cancelled") == "Flight cannot be cancelled after departing"
+    assert transition_error("Cancelled", "Delayed") == "Cancelled flights cannot be rescheduled"
@@ -0,0 +1,66 @@
+import pytest
+import datetime as dt
+from app.main import flights, deletion_log
+
+@pytest.fixture(autouse=True)
+def reset_flights():
+    flights.clear()
+    deletion_log.clear()
+    flights.append({
+        "flight_number": "FL123",
+        "arrival": "Los Angeles",
+        "departure_time": dt.datetime(2023, 10, 1, 10, 0),
+        "gate": "A1",
+        "status": "Scheduled"
+    })
+
+def test_list_changes_without_since(client):
+    response = client.get("/flights/changes")
+    assert response.status_code == 200
+    assert response.json() == {"last": flights.last_sequence(), "changes": []}
+
+def test_list_changes(client):
+    since = client.get("/flights/changes").json()["last"]
+    client.put("/flights/?flight_number=FL123&flight_status=Delayed")
+    client.delete("/flights/?flight_number=FL123&reason=Weather")
+
+    response = client.get(f"/flights/changes?since={since}")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["last"] == since + 3
+    assert body["changes"] == [
+        {
+            "sequence": since + 1,
+            "op": "upsert",
+            "flight": {
+                "flight_number": "FL123",
+                "arrival": "Los Angeles",
+                "departure_time": "2023-10-01T10:00:00",
+                "gate": "A1",
+                "status": "Delayed"
+            }
+        },
+        {"sequence": since + 2, "op": "delete", "flight_number": "FL123"},
+        {"sequence": since + 3, "op": "log", "flight_number": "FL123", "reason": "Weather"}
+    ]
+
+def test_list_changes_pages(client):
+    since = client.get("/flights/changes").json()["last"]
+    client.put("/flights/?flight_number=FL123&flight_status=Delayed")
+    client.put("/flights/?flight_number=FL123&flight_status=Boarding")
+
+    body = client.get(f"/flights/changes?since={since}&limit=1").json()
+    assert [change["flight"]["status"] for change in body["changes"]] == ["Delayed"]
+    body = client.get(f"/flights/changes?since={body['last']}&limit=1").json()
+    assert [change["flight"]["status"] for change in body["changes"]] == ["Boarding"]
+    assert client.get(f"/flights/changes?since={body['last']}").json() == {"last": body["last"], "changes": []}
+
+def test_list_changes_unknown_sequence(client):
+    response = client.get("/flights/changes?since=1")
+    assert response.status_code == 410
+    assert response.json() == {"detail": "Changes since this sequence are no longer available"}
+
+def test_list_changes_sequence_fits_in_a_double(client):
+    client.put("/flights/?flight_number=FL123&flight_status=Delayed")
+    body = client.get("/flights/changes").json()
+    assert 0 < body["last"] <= 2 ** 53 - 1
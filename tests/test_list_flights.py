@@ -105,4 +105,94 @@ def test_list_flights_with_no_filter(client):
     flights_data = response.json()
     assert len(flights_data) == 3
     for flight in flights_data:
-        assert flight["status"] in ["Scheduled", "Cancelled"]
\ No newline at end of file
+        assert flight["status"] in ["Scheduled", "Cancelled"]
+
+def test_list_flights_range_filter(client):
+    start = (dt.datetime.now() - dt.timedelta(days=4)).date()
+    end = (dt.datetime.now() - dt.timedelta(days=2)).date()
+    response = client.get(f"/flights/?from={start.isoformat()}&to={end.isoformat()}")
+    assert response.status_code == 200
+    assert [flight["flight_number"] for flight in response.json()] == ["FL126"]
+
+def test_list_flights_range_filter_inclusive_end_day(client):
+    today = dt.datetime.now().date()
+    response = client.get(f"/flights/?from={today.isoformat()}&to={today.isoformat()}")
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+
+def test_list_flights_range_filter_compact_end_day(client):
+    today = dt.datetime.now().date()
+    response = client.get(f"/flights/?from={today:%Y%m%d}&to={today:%Y%m%d}")
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+
+def test_list_flights_open_range_filter(client):
+    start = (dt.datetime.now() - dt.timedelta(days=4)).date()
+    response = client.get(f"/flights/?from={start.isoformat()}")
+    assert response.status_code == 200
+    assert len(response.json()) == 4
+
+    response = client.get(f"/flights/?to={start.isoformat()}")
+    assert response.status_code == 200
+    assert response.json() == []
+
+def test_list_flights_range_filter_with_status(client):
+    start = (dt.datetime.now() - dt.timedelta(days=4)).date()
+    response = client.get(f"/flights/?flight_status=Cancelled&from={start.isoformat()}")
+    assert response.status_code == 200
+    assert [flight["flight_number"] for flight in response.json()] == ["FL125"]
+
+def test_list_flights_invalid_range_filter(client):
+    response = client.get("/flights/?from=invalid-date")
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Invalid from filter"}
+
+    response = client.get("/flights/?to=invalid-date")
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Invalid to filter"}
+
+def test_list_flights_range_and_day_filter(client):
+    today = dt.datetime.now().date()
+    response = client.get(f"/flights/?departure_time={today.isoformat()}&from={today.isoformat()}")
+    assert response.status_code == 422
+    assert "detail" in response.json()
+
+def test_list_flights_cached_until_changed(client):
+    first = client.get("/flights/?departure_time=all")
+    assert client.get("/flights/?departure_time=all").content == first.content
+
+    client.put("/flights/?flight_number=FL123&flight_status=Delayed")
+    response = client.get("/flights/?departure_time=all")
+    assert response.content != first.content
+    assert [f["status"] for f in response.json() if f["flight_number"] == "FL123"] == ["Delayed"]
+
+def test_list_flights_cached_per_filter(client):
+    assert len(client.get("/flights/?departure_time=all").json()) == 4
+    assert len(client.get("/flights/?departure_time=all&flight_status=Cancelled").json()) == 1
+    assert len(client.get("/flights/").json()) == 3
+
+def test_list_flights_not_modified(client):
+    response = client.get("/flights/?departure_time=all")
+    etag = response.headers["ETag"]
+    response = client.get("/flights/?departure_time=all", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+def test_list_flights_etag_depends_on_filter(client):
+    etag = client.get("/flights/?departure_time=all").headers["ETag"]
+    response = client.get("/flights/?departure_time=all&flight_status=Cancelled", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+def test_list_flights_etag_changes_after_update(client):
+    etag = client.get("/flights/?departure_time=all").headers["ETag"]
+    client.put("/flights/?flight_number=FL123&flight_status=Delayed")
+    response = client.get("/flights/?departure_time=all", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+def test_list_flights_page_not_modified(client):
+    etag = client.get("/flights/?departure_time=all&limit=2").headers["ETag"]
+    response = client.get("/flights/?departure_time=all&limit=2", headers={"If-None-Match": f'W/{etag}, "other"'})
+    assert response.status_code == 304
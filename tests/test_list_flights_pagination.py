@@ -0,0 +1,61 @@
+import pytest
+import datetime as dt
+from app.main import flights
+
+@pytest.fixture(autouse=True)
+def reset_flights():
+    flights.clear()
+    base = dt.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    for i in range(7):
+        flights.append({
+            "flight_number": f"FL{100 + i}",
+            "arrival": "Los Angeles",
+            "departure_time": base + dt.timedelta(hours=3 * i),
+            "gate": "A1",
+            "status": "Cancelled" if i % 2 else "Departed"
+        })
+
+def fetch_all(client, url):
+    numbers = []
+    response = client.get(url)
+    while True:
+        assert response.status_code == 200
+        numbers += [flight["flight_number"] for flight in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return numbers
+        response = client.get(f"{url}&cursor={cursor}")
+
+def test_paginate_flights(client):
+    response = client.get("/flights/?limit=3")
+    assert response.status_code == 200
+    assert [flight["flight_number"] for flight in response.json()] == ["FL100", "FL101", "FL102"]
+    assert "X-Next-Cursor" in response.headers
+    assert fetch_all(client, "/flights/?limit=3") == [f"FL{100 + i}" for i in range(7)]
+
+def test_paginate_flights_last_page_has_no_cursor(client):
+    response = client.get("/flights/?departure_time=all&limit=7")
+    assert response.status_code == 200
+    assert len(response.json()) == 7
+    assert "X-Next-Cursor" not in response.headers
+
+def test_paginate_flights_with_status(client):
+    assert fetch_all(client, "/flights/?flight_status=Cancelled&departure_time=all&limit=2") == ["FL101", "FL103", "FL105"]
+
+def test_paginate_flights_stable_after_delete(client):
+    response = client.get("/flights/?limit=2")
+    cursor = response.headers["X-Next-Cursor"]
+    client.delete("/flights/?flight_number=FL101&reason=Test%20elimination")
+    client.delete("/flights/?flight_number=FL102&reason=Test%20elimination")
+    response = client.get(f"/flights/?limit=2&cursor={cursor}")
+    assert [flight["flight_number"] for flight in response.json()] == ["FL103", "FL104"]
+
+def test_paginate_flights_invalid_cursor(client):
+    response = client.get("/flights/?limit=2&cursor=invalid")
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Invalid cursor"}
+
+def test_paginate_flights_limit_too_large(client):
+    response = client.get("/flights/?limit=1001")
+    assert response.status_code == 422
+    assert "detail" in response.json()
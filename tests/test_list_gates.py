@@ -0,0 +1,81 @@
+import pytest
+import datetime as dt
+from app.main import flights
+
+@pytest.fixture(autouse=True)
+def reset_flights():
+    flights.clear()
+    flights.append({
+        "flight_number": "FL123",
+        "arrival": "Los Angeles",
+        "departure_time": dt.datetime.now(),
+        "gate": "A1",
+        "status": "Scheduled"
+    })
+    flights.append({
+        "flight_number": "FL124",
+        "arrival": "New York",
+        "departure_time": dt.datetime.now(),
+        "gate": "B2",
+        "status": "Boarding"
+    })
+    flights.append({
+        "flight_number": "FL125",
+        "arrival": "Chicago",
+        "departure_time": dt.datetime.now(),
+        "gate": "C3",
+        "status": "Cancelled"
+    })
+
+def gate(response, name):
+    return next(g for g in response.json() if g["gate"] == name)
+
+def test_list_gates(client):
+    response = client.get("/gates/")
+    assert response.status_code == 200
+    assert len(response.json()) == 5
+    assert gate(response, "A1") == {"gate": "A1", "free": False, "flight_number": "FL123"}
+    assert gate(response, "B2") == {"gate": "B2", "free": False, "flight_number": "FL124"}
+    assert gate(response, "C3") == {"gate": "C3", "free": True, "flight_number": None}
+    assert gate(response, "D4")["free"]
+
+def test_gate_freed_after_cancellation(client):
+    response = client.put("/flights/?flight_number=FL123&flight_status=Cancelled")
+    assert response.status_code == 200
+    response = client.get("/gates/")
+    assert gate(response, "A1") == {"gate": "A1", "free": True, "flight_number": None}
+
+def test_gate_freed_after_elimination(client):
+    response = client.delete("/flights/?flight_number=FL124&reason=Test%20elimination")
+    assert response.status_code == 200
+    response = client.get("/gates/")
+    assert gate(response, "B2")["free"]
+
+def test_gate_reused_after_cancellation(client):
+    flight = {
+        "flight_number": "FL200",
+        "arrival": "Boston",
+        "departure_time": "2023-10-01T10:00:00Z",
+        "gate": "A1"
+    }
+    response = client.post("/flights/", json=flight)
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Gate already used by another flight"}
+
+    client.put("/flights/?flight_number=FL123&flight_status=Cancelled")
+    response = client.post("/flights/", json=flight)
+    assert response.status_code == 201
+    response = client.get("/gates/")
+    assert gate(response, "A1")["flight_number"] == "FL200"
+
+def test_registered_gate_is_occupied(client):
+    flight = {
+        "flight_number": "FL200",
+        "arrival": "Boston",
+        "departure_time": "2023-10-01T10:00:00Z",
+        "gate": "C3"
+    }
+    response = client.post("/flights/", json=flight)
+    assert response.status_code == 201
+    response = client.get("/gates/")
+    assert gate(response, "C3") == {"gate": "C3", "free": False, "flight_number": "FL200"}
@@ -0,0 +1,81 @@
+import pytest
+import datetime as dt
+from app.main import flights, deletion_log
+from app.metrics import Counter, Gauge, Histogram, Registry
+
+@pytest.fixture(autouse=True)
+def reset_flights():
+    flights.clear()
+    deletion_log.clear()
+    flights.append({
+        "flight_number": "FL123",
+        "arrival": "Los Angeles",
+        "departure_time": dt.datetime(2023, 10, 1, 10, 0),
+        "gate": "A1",
+        "status": "Scheduled"
+    })
+
+def sample(client, name):
+    for line in client.get("/metrics").text.splitlines():
+        if line.startswith(name + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+def test_metrics_format(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE flights_request_duration_seconds histogram" in response.text
+
+def test_metrics_gauges(client):
+    client.delete("/flights/?flight_number=FL123&reason=Weather")
+    assert sample(client, 'flights_by_status{status="Scheduled"}') == 0
+    assert sample(client, 'flights_gate_occupied{gate="A1"}') == 0
+    assert sample(client, "flights_deletion_log_entries") == 1
+
+def test_metrics_count_transitions_and_rejections(client):
+    transitions = 'flights_transitions_total{from_status="Scheduled",to_status="Delayed"}'
+    rejections = 'flights_rejections_total{reason="Flight was not in Departing status"}'
+    before = sample(client, transitions), sample(client, rejections)
+    client.put("/flights/?flight_number=FL123&flight_status=Delayed")
+    client.put("/flights/?flight_number=FL123&flight_status=Departed")
+    client.put("/flights/batch", json=[{"flight_number": "FL123", "flight_status": "Departed"}])
+    assert sample(client, transitions) == before[0] + 1
+    assert sample(client, rejections) == before[1] + 2
+
+def test_metrics_request_latency(client):
+    name = 'flights_request_duration_seconds_count{method="PUT",route="/flights/",status_code="404"}'
+    before = sample(client, name)
+    client.put("/flights/?flight_number=FL999&flight_status=Delayed")
+    assert sample(client, name) == before + 1
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5, "/a")
+    assert histogram.render()[2:] == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a",le="1.0"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a"} 5.55',
+        'latency_seconds_count{route="/a"} 3'
+    ]
+
+def test_counter_escapes_labels():
+    counter = Counter("rejections_total", "Rejections", ("reason",))
+    counter.inc('Bad "value"\n')
+    assert counter.render()[2] == 'rejections_total{reason="Bad \\"value\\"\\n"} 1'
+
+def test_registry_renders_collected_gauges():
+    registry = Registry()
+    counter = registry.register(Counter("requests_total", "Requests"))
+    collects = []
+    registry.register(Gauge("flights", "Flights", (), lambda: collects.append(1) or 3))
+    collected = registry.collect()
+    assert collects == [1]
+    counter.inc()
+    text = registry.render(collected)
+    assert collects == [1]
+    assert "requests_total 1\n" in text
+    assert "flights 3\n" in text
@@ -0,0 +1,72 @@
+import pytest
+import marshal
+from app.main import profiler
+from app.profiling import RequestProfiler
+
+@pytest.fixture(autouse=True)
+def reset_profiler():
+    profiler.token = "secret"
+    profiler.sample_rate = 0.0
+    profiler.profiles.clear()
+    yield
+    profiler.token = None
+    profiler.sample_rate = 0.0
+    profiler.profiles.clear()
+
+def test_timing_headers(client):
+    response = client.get("/gates/")
+    assert float(response.headers["X-Process-Time"]) >= 0
+    assert response.headers["Server-Timing"].startswith("app;dur=")
+
+def test_profile_requested_with_token(client):
+    client.get("/flights/?departure_time=all")
+    client.get("/flights/?departure_time=all", headers={"X-Profile-Token": "secret"})
+    client.get("/gates/", headers={"X-Profile-Token": "wrong"})
+
+    response = client.get("/debug/profiles", headers={"X-Profile-Token": "secret"})
+    assert response.status_code == 200
+    profiles = response.json()
+    assert [(p["method"], p["path"], p["query"], p["status_code"]) for p in profiles] == [
+        ("GET", "/flights/", "departure_time=all", 200)
+    ]
+
+    profile_id = profiles[0]["id"]
+    response = client.get(f"/debug/profiles/{profile_id}", headers={"X-Profile-Token": "secret"})
+    assert response.status_code == 200
+    assert isinstance(marshal.loads(response.content), dict)
+    response = client.get(f"/debug/profiles/{profile_id}?format=text", headers={"X-Profile-Token": "secret"})
+    assert "function calls" in response.text
+
+def test_sampled_profiles_are_bounded(client):
+    profiler.sample_rate = 1.0
+    for _ in range(profiler.profiles.maxlen + 5):
+        client.get("/gates/")
+    assert len(profiler.profiles) == profiler.profiles.maxlen
+
+def test_profiles_require_token(client):
+    response = client.get("/debug/profiles", headers={"X-Profile-Token": "wrong"})
+    assert response.status_code == 403
+    assert response.json() == {"detail": "Invalid profile token"}
+    response = client.get("/debug/profiles/999", headers={"X-Profile-Token": "secret"})
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Profile not found"}
+
+def test_profiling_disabled_without_token(client):
+    profiler.token = None
+    response = client.get("/debug/profiles")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Profiling is disabled"}
+
+def test_sampling_requires_token():
+    with pytest.raises(ValueError):
+        RequestProfiler(20, sample_rate=0.5)
+
+def test_sampling_skips_without_token(client):
+    profiler.token = None
+    profiler.sample_rate = 1.0
+    client.get("/gates/")
+    assert len(profiler.profiles) == 0
+
+def test_event_stream_is_not_profiled():
+    assert profiler.start({"path": "/flights/stream", "headers": [(b"x-profile-token", b"secret")]}) is None
+    assert profiler.start({"path": "/debug/profiles", "headers": [(b"x-profile-token", b"secret")]}) is None
@@ -0,0 +1,63 @@
+import pytest
+from app.main import flights
+
+@pytest.fixture(autouse=True)
+def reset_flights():
+    flights.clear()
+
+def make_flight(flight_number, gate, status="Scheduled"):
+    return {
+        "flight_number": flight_number,
+        "arrival": "Los Angeles",
+        "departure_time": "2023-10-01T10:00:00Z",
+        "gate": gate,
+        "status": status
+    }
+
+def test_register_flights_batch(client):
+    batch = [make_flight("FL125", "A1", "Cancelled"), make_flight("FL123", "A1"), make_flight("FL124", "B2")]
+    response = client.post("/flights/batch", json=batch)
+    assert response.status_code == 201
+    assert response.json() == [
+        {"flight_number": "FL125", "status_code": 201, "detail": None},
+        {"flight_number": "FL123", "status_code": 201, "detail": None},
+        {"flight_number": "FL124", "status_code": 201, "detail": None}
+    ]
+    assert len(flights) == 3
+    assert flights.gate_occupant("A1") == "FL123"
+
+def test_register_flights_batch_empty(client):
+    response = client.post("/flights/batch", json=[])
+    assert response.status_code == 201
+    assert response.json() == []
+
+def test_register_flights_batch_atomic_failure(client):
+    batch = [make_flight("FL123", "A1"), make_flight("FL123", "B2"), make_flight("FL124", "A1"), make_flight("FL#125", "C3")]
+    response = client.post("/flights/batch", json=batch)
+    assert response.status_code == 422
+    assert response.json() == {"detail": [
+        {"index": 1, "flight_number": "FL123", "status_code": 422, "detail": "Flight number already exists"},
+        {"index": 2, "flight_number": "FL124", "status_code": 422, "detail": "Gate already used by another flight"},
+        {"index": 3, "flight_number": "FL#125", "status_code": 422, "detail": "Invalid flight number"}
+    ]}
+    assert len(flights) == 0
+
+def test_register_flights_batch_conflicts_with_store(client):
+    response = client.post("/flights/", json=make_flight("FL123", "A1"))
+    assert response.status_code == 201
+    response = client.post("/flights/batch", json=[make_flight("FL123", "B2"), make_flight("FL124", "A1")])
+    assert response.status_code == 422
+    assert [item["detail"] for item in response.json()["detail"]] == ["Flight number already exists", "Gate already used by another flight"]
+
+def test_register_flights_batch_not_atomic(client):
+    batch = [make_flight("FL123", "A1"), make_flight("FL124", "A1"), make_flight("FL125", "InvalidGate"), make_flight("FL126", "B2")]
+    response = client.post("/flights/batch?atomic=false", json=batch)
+    assert response.status_code == 201
+    assert [item["status_code"] for item in response.json()] == [201, 422, 422, 201]
+    assert response.json()[2]["detail"] == "Invalid gate"
+    assert [f["flight_number"] for f in flights] == ["FL123", "FL126"]
+
+def test_register_flights_batch_invalid_body(client):
+    response = client.post("/flights/batch", json=[{"flight_number": "FL123"}])
+    assert response.status_code == 422
+    assert "detail" in response.json()
@@ -0,0 +1,18 @@
+from app.cache import ResponseCache
+
+def test_get_returns_body_for_current_version():
+    cache = ResponseCache(2)
+    cache.put("all", 1, b"[]")
+    assert cache.get("all", 1) == b"[]"
+    assert cache.get("all", 2) is None
+    assert cache.get("today", 1) is None
+
+def test_evicts_least_recently_used():
+    cache = ResponseCache(2)
+    cache.put("all", 1, b"all")
+    cache.put("today", 1, b"today")
+    cache.get("all", 1)
+    cache.put("Scheduled", 1, b"Scheduled")
+    assert len(cache) == 2
+    assert cache.get("today", 1) is None
+    assert cache.get("all", 1) == b"all"
@@ -0,0 +1,94 @@
+import pytest
+import datetime as dt
+from app.snapshot import MappedSnapshot, MappedFlightRecord, formats, header_format, naive_offset, same_number, write_snapshot
+from app.store import FlightRecord, FlightStore
+
+@pytest.fixture
+def flights():
+    return [
+        FlightRecord("FL124", "New York", dt.datetime(2023, 10, 1, 12, 0), "B2", "Boarding"),
+        FlightRecord("FL123", "Los Angeles", dt.datetime(2023, 10, 1, 10, 0, tzinfo=dt.timezone.utc), "A1", "Scheduled"),
+        FlightRecord("fl125", "Chicago", dt.datetime(2023, 10, 2, 9, 30, tzinfo=dt.timezone(dt.timedelta(hours=-5))), "A1", "Cancelled"),
+        FlightRecord("ÅÅ12345678", "Bogotá", dt.datetime(2023, 9, 30, 23, 0), "C3", "Departed")
+    ]
+
+@pytest.fixture
+def snapshot(tmp_path, flights):
+    path = str(tmp_path / "snapshot.bin")
+    write_snapshot(path, flights, [{"flight_number": "FL100", "reason": "Test elimination"}])
+    return MappedSnapshot(path)
+
+def test_snapshot_round_trip(snapshot, flights):
+    assert len(snapshot) == 4
+    rows = list(snapshot.rows())
+    assert [row[1] for row in rows] == ["ÅÅ12345678", "FL123", "FL124", "FL125"]
+    records = {record.flight_number: record for *_, record in rows}
+    for flight in flights:
+        assert records[flight.flight_number].to_dict() == flight.to_dict()
+    assert snapshot.deletion_log() == [{"flight_number": "FL100", "reason": "Test elimination"}]
+
+def test_snapshot_records_decode_lazily(snapshot):
+    record = next(snapshot.rows())[4]
+    assert isinstance(record, MappedFlightRecord)
+    assert record.flight_number == "ÅÅ12345678"
+    record.status = "Cancelled"
+    assert record["arrival"] == "Bogotá"
+    assert record.status == "Cancelled"
+
+def test_load_snapshot_into_store(snapshot):
+    store = FlightStore()
+    store._load_sorted(snapshot.rows())
+    assert len(store) == 4
+    assert store.gate_occupant("A1") == "FL123"
+    assert store.gate_occupant("C3") is None
+    assert [f.flight_number for f in store.with_status("Boarding")] == ["FL124"]
+    assert [f.flight_number for f in store.departing_on(dt.date(2023, 10, 1))] == ["FL123", "FL124"]
+    store.set_status("FL124", "Departing")
+    assert store.get("FL124").status == "Departing"
+    assert store.get("FL124").gate == "B2"
+
+def test_snapshot_gate_shared_by_active_flights(tmp_path):
+    path = str(tmp_path / "snapshot.bin")
+    write_snapshot(path, [
+        FlightRecord("FL123", "Los Angeles", dt.datetime(2023, 10, 1, 10, 0), "A1", "Scheduled"),
+        FlightRecord("FL124", "New York", dt.datetime(2023, 10, 1, 12, 0), "A1", "Boarding")
+    ], [])
+    store = FlightStore()
+    store._load_sorted(MappedSnapshot(path).rows())
+    store.set_status("FL123", "Departed")
+    assert store.gate_occupant("A1") == "FL124"
+
+def test_not_a_snapshot(tmp_path):
+    path = tmp_path / "snapshot.bin"
+    path.write_bytes(b"not a snapshot file")
+    with pytest.raises(ValueError):
+        MappedSnapshot(str(path))
+
+def test_snapshot_with_many_distinct_strings(tmp_path):
+    flights = [
+        FlightRecord(f"FL{i}", f"City {i}", dt.datetime(2023, 10, 1, 10, 0), "A1", "Departed")
+        for i in range(70000)
+    ]
+    path = str(tmp_path / "snapshot.bin")
+    write_snapshot(path, flights, [])
+    snapshot = MappedSnapshot(path)
+    assert len(snapshot) == 70000
+    records = {record.flight_number: record for *_, record in snapshot.rows()}
+    assert records["FL69999"].arrival == "City 69999"
+    assert records["FL69999"].gate == "A1"
+    assert records["FL69999"].status == "Departed"
+
+def test_read_version_one_snapshot(tmp_path):
+    record_format, string_length_format = formats[b"FLTSNAP1"]
+    strings = [b"Los Angeles", b"A1", b"Scheduled"]
+    path = tmp_path / "snapshot.bin"
+    path.write_bytes(
+        header_format.pack(b"FLTSNAP1", len(strings), 1, 2)
+        + b"".join(string_length_format.pack(len(value)) + value for value in strings)
+        + record_format.pack(b"FL123", 0, naive_offset, same_number, 0, 1, 2)
+        + b"[]"
+    )
+    snapshot = MappedSnapshot(str(path))
+    record = next(snapshot.rows())[4]
+    assert record.to_dict() == FlightRecord("FL123", "Los Angeles", dt.datetime(1970, 1, 1), "A1").to_dict()
+    assert snapshot.deletion_log() == []
@@ -611,3 +611,18 @@ def test_flight_number_with_spaces(client):
     assert response.status_code == 422
     assert "detail" in response.json()
 
+
+def test_update_registered_flight(client):
+    flight = {
+        "flight_number": "FL200",
+        "arrival": "Boston",
+        "departure_time": "2023-10-01T10:00:00Z",
+        "gate": "E5"
+    }
+    response = client.post("/flights/", json=flight)
+    assert response.status_code == 201
+    response = client.put("/flights/?flight_number=FL200&flight_status=Awaiting%20Boarding")
+    assert response.status_code == 200
+    assert response.json()["status"] == "Awaiting Boarding"
+    response = client.get("/flights/?departure_time=all&flight_status=Awaiting%20Boarding")
+    assert [f["flight_number"] for f in response.json()] == ["FL200"]
@@ -0,0 +1,98 @@
+import pytest
+import datetime as dt
+from app.main import flights
+
+@pytest.fixture(autouse=True)
+def reset_flights():
+    flights.clear()
+    flights.append({
+        "flight_number": "FL123",
+        "arrival": "Los Angeles",
+        "departure_time": dt.datetime.now(),
+        "gate": "A1",
+        "status": "Scheduled"
+    })
+    flights.append({
+        "flight_number": "FL124",
+        "arrival": "New York",
+        "departure_time": dt.datetime.now(),
+        "gate": "B2",
+        "status": "Boarding"
+    })
+    flights.append({
+        "flight_number": "FL125",
+        "arrival": "Chicago",
+        "departure_time": dt.datetime.now(),
+        "gate": "C3",
+        "status": "Cancelled"
+    })
+
+def test_update_flight_statuses(client):
+    batch = [
+        {"flight_number": "FL123", "flight_status": "Delayed"},
+        {"flight_number": "fl124", "flight_status": "Cancelled"}
+    ]
+    response = client.put("/flights/batch", json=batch)
+    assert response.status_code == 200
+    assert response.json() == [
+        {"flight_number": "FL123", "status_code": 200, "detail": None},
+        {"flight_number": "fl124", "status_code": 200, "detail": None}
+    ]
+    assert flights.get("FL123").status == "Delayed"
+    assert flights.get("FL124").status == "Cancelled"
+
+def test_update_flight_statuses_partial(client):
+    batch = [
+        {"flight_number": "FL123", "flight_status": "Boarding"},
+        {"flight_number": "FL124", "flight_status": "Delayed"},
+        {"flight_number": "FL125", "flight_status": "Delayed"},
+        {"flight_number": "FL999", "flight_status": "Delayed"},
+        {"flight_number": "FL#123", "flight_status": "Delayed"},
+        {"flight_number": "FL123", "flight_status": "InvalidStatus"}
+    ]
+    response = client.put("/flights/batch", json=batch)
+    assert response.status_code == 200
+    assert [(item["status_code"], item["detail"]) for item in response.json()] == [
+        (422, "Flight was not in Awaiting Boarding status"),
+        (200, None),
+        (422, "Cancelled flights cannot be rescheduled"),
+        (404, "Flight not found"),
+        (422, "Invalid flight number format"),
+        (422, "Invalid status")
+    ]
+    assert flights.get("FL123").status == "Scheduled"
+    assert flights.get("FL124").status == "Delayed"
+
+def test_update_flight_statuses_sequence(client):
+    batch = [
+        {"flight_number": "FL123", "flight_status": "Awaiting Boarding"},
+        {"flight_number": "FL123", "flight_status": "Boarding"},
+        {"flight_number": "FL123", "flight_status": "Scheduled"}
+    ]
+    response = client.put("/flights/batch", json=batch)
+    assert [item["status_code"] for item in response.json()] == [200, 200, 422]
+    assert response.json()[2]["detail"] == "Flight was not in Scheduled status"
+    assert flights.get("FL123").status == "Boarding"
+
+def test_update_flight_statuses_atomic_failure(client):
+    batch = [
+        {"flight_number": "FL123", "flight_status": "Cancelled"},
+        {"flight_number": "FL125", "flight_status": "Scheduled"}
+    ]
+    response = client.put("/flights/batch?atomic=true", json=batch)
+    assert response.status_code == 422
+    assert response.json() == {"detail": [
+        {"index": 1, "flight_number": "FL125", "status_code": 422, "detail": "Cancelled flights cannot be rescheduled"}
+    ]}
+    assert flights.get("FL123").status == "Scheduled"
+
+def test_update_flight_statuses_atomic_success(client):
+    batch = [
+        {"flight_number": "FL123", "flight_status": "Cancelled"},
+        {"flight_number": "FL124", "flight_status": "Departing"}
+    ]
+    response = client.put("/flights/batch?atomic=true", json=batch)
+    assert response.status_code == 200
+    assert flights.get("FL123").status == "Cancelled"
+    assert flights.get("FL124").status == "Departing"
+    assert flights.gate_occupant("A1") is None